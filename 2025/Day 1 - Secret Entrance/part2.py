@@ -45,26 +45,19 @@ def count_zero_crossings(current_position, direction, clicks):
     Returns:
         Number of times the dial points at 0 during this rotation
     """
-    count = 0
-
     if clicks == 0:
         return 0
 
     if direction == 'R':
         # Moving right (toward higher numbers)
-        # Count how many times we cross 0 (which is when position % 100 == 0)
-        # We cross 0 when going from 99 to 0
-        for i in range(1, clicks + 1):
-            if (current_position + i) % 100 == 0:
-                count += 1
+        # We hit 0 every time position + i reaches a multiple of 100
+        return (current_position + clicks) // 100
     elif direction == 'L':
         # Moving left (toward lower numbers)
-        # Count how many times we cross 0
-        for i in range(1, clicks + 1):
-            if (current_position - i) % 100 == 0:
-                count += 1
-
-    return count
+        # Mirror the dial so that moving left becomes moving right from (100 - position)
+        return ((100 - current_position) % 100 + clicks) // 100
+    else:
+        raise ValueError(f"Invalid direction: {direction}")
 
 
 def parse_rotation(rotation_str):
@@ -124,6 +117,61 @@ def solve_safe(rotations, verbose=True):
     return position, zero_count
 
 
+class DialIndex:
+    """
+    Prefix index over a dial history, built in a single pass.
+
+    positions[k] is the dial position after k rotations (positions[0] is the
+    start), landings[k] counts rotations 1..k that ended on 0 (part 1 method)
+    and clicks[k] counts every click through 0 during rotations 1..k
+    (method 0x434C49434B, part 2). Queries between steps are O(1).
+    """
+
+    def __init__(self, rotations=(), start=50):
+        self.positions = [start]
+        self.landings = [0]
+        self.clicks = [0]
+        self.extend(rotations)
+
+    def __len__(self):
+        """Number of rotations indexed so far."""
+        return len(self.positions) - 1
+
+    def append(self, rotation_str):
+        """Index one more rotation in O(1)."""
+        direction, clicks = parse_rotation(rotation_str)
+        position = self.positions[-1]
+        new_position = rotate_dial(position, direction, clicks)
+
+        self.positions.append(new_position)
+        self.landings.append(self.landings[-1] + (new_position == 0))
+        self.clicks.append(self.clicks[-1] + count_zero_crossings(position, direction, clicks))
+
+    def extend(self, rotations):
+        """Index several rotations, in order."""
+        for rotation_str in rotations:
+            self.append(rotation_str)
+
+    def _check_steps(self, i, j):
+        if not 0 <= i <= j <= len(self):
+            raise IndexError(f"Invalid step range: {i}..{j} (indexed {len(self)} rotation(s))")
+
+    def position_at(self, k):
+        """Dial position after k rotations (k = 0 is the starting position)."""
+        self._check_steps(k, k)
+        return self.positions[k]
+
+    def zero_landings(self, i, j):
+        """Rotations i+1..j that ended on 0 (part 1 method)."""
+        self._check_steps(i, j)
+        return self.landings[j] - self.landings[i]
+
+    def zero_clicks(self, i, j):
+        """Clicks through 0 during rotations i+1..j (method 0x434C49434B)."""
+        self._check_steps(i, j)
+        return self.clicks[j] - self.clicks[i]
+
+
 def main():
     """Main function to run the safe dial simulator."""
     input_file = "input.txt"
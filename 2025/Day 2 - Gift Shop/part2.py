@@ -1,3 +1,9 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+
+
 def is_invalid_id(num):
     """
     Check if a number is an invalid ID (Part 2 rules).
@@ -65,18 +71,198 @@ def parse_ranges(input_text):
     return ranges
 
 
+def is_primitive_pattern(pattern_str):
+    """
+    Check that a pattern is not itself a shorter pattern repeated.
+    For example: 123 and 1211 are primitive, 1212 (12 twice) and 777 are not.
+    """
+    length = len(pattern_str)
+    for sub_len in range(1, length // 2 + 1):
+        if length % sub_len == 0 and pattern_str[:sub_len] * (length // sub_len) == pattern_str:
+            return False
+    return True
+
+
+def generate_invalid_ids(start, end):
+    """
+    Generate invalid IDs in [start, end] in increasing order, without scanning the range.
+    An invalid ID of L digits built from a k-digit pattern repeated r = L / k times equals
+    pattern * (10^L - 1) / (10^k - 1), so only patterns landing inside the range are built.
+    Each ID is emitted once, from its smallest repeating unit (a primitive pattern):
+    1111 comes from 1 only, never again from 11.
+    """
+    min_length = len(str(max(start, 1)))
+    max_length = len(str(end))
+
+    for length in range(min_length, max_length + 1):
+        ids_of_length = []
+
+        # The pattern must repeat at least twice
+        for pattern_len in range(1, length // 2 + 1):
+            if length % pattern_len != 0:
+                continue
+
+            multiplier = (10 ** length - 1) // (10 ** pattern_len - 1)
+
+            # Patterns have no leading zero, so they span [10^(k-1), 10^k - 1]
+            lo = max(10 ** (pattern_len - 1), -(-start // multiplier))
+            hi = min(10 ** pattern_len - 1, end // multiplier)
+
+            for pattern in range(lo, hi + 1):
+                if is_primitive_pattern(str(pattern)):
+                    ids_of_length.append(pattern * multiplier)
+
+        ids_of_length.sort()
+        yield from ids_of_length
+
+
 def find_invalid_ids_in_range(start, end):
     """
     Find all invalid IDs in the given range [start, end].
     Returns a list of invalid IDs.
     """
-    invalid_ids = []
+    return list(generate_invalid_ids(start, end))
 
-    for num in range(start, end + 1):
-        if is_invalid_id(num):
-            invalid_ids.append(num)
 
-    return invalid_ids
+def mobius(n):
+    """
+    Möbius function: 0 if n has a squared prime factor,
+    otherwise (-1)^k for k distinct prime factors.
+    """
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def sum_periodic_ids(start, end, length, pattern_len):
+    """
+    Count and sum every length-digit number in [start, end] made of a pattern_len-digit
+    pattern repeated (primitive or not). These numbers form an arithmetic series.
+    Returns a (count, total) tuple.
+    """
+    multiplier = (10 ** length - 1) // (10 ** pattern_len - 1)
+    lo = max(10 ** (pattern_len - 1), -(-start // multiplier))
+    hi = min(10 ** pattern_len - 1, end // multiplier)
+
+    if lo > hi:
+        return 0, 0
+
+    n = hi - lo + 1
+    return n, multiplier * (lo + hi) * n // 2
+
+
+def sum_invalid_ids_in_range(start, end):
+    """
+    Count and sum the invalid IDs in [start, end] arithmetically.
+    A length-L ID is invalid if it repeats with some period L/d for a divisor d > 1.
+    Those period classes overlap (period L/2 and L/3 share period L/6), so the union
+    is taken by inclusion-exclusion: sum of -mu(d) * S(L/d) over divisors d > 1 of L.
+    Returns a (count, total) tuple.
+    """
+    count = 0
+    total = 0
+    min_length = len(str(max(start, 1)))
+    max_length = len(str(end))
+
+    for length in range(min_length, max_length + 1):
+        for d in range(2, length + 1):
+            if length % d != 0:
+                continue
+
+            sign = -mobius(d)
+            if sign == 0:
+                continue
+
+            class_count, class_total = sum_periodic_ids(start, end, length, length // d)
+            count += sign * class_count
+            total += sign * class_total
+
+    return count, total
+
+
+class InvalidIdTable:
+    """
+    Sorted table of every invalid ID (repeated at least twice) up to max_digits digits,
+    with prefix sums, so each range query is two bisects and a subtraction.
+
+    The table is stored as packed unsigned 64-bit arrays and can be saved once
+    and memory-mapped back by later runs sharing the same number domain.
+    """
+
+    # The magic records the rule the table was built for (patterns repeated at least twice),
+    # so a table from the other part is rejected instead of giving wrong sums
+    MAGIC = b'AOCIDR01'
+    HEADER = struct.Struct('<8sQQ')
+
+    def __init__(self, ids, prefix, max_digits):
+        self.ids = ids
+        self.prefix = prefix
+        self.max_digits = max_digits
+
+    @classmethod
+    def build(cls, max_digits=12):
+        """Precompute the table for all IDs with at most max_digits digits."""
+        ids = array('Q', generate_invalid_ids(1, 10 ** max_digits - 1))
+        prefix = array('Q', [0])
+        running = 0
+        for num in ids:
+            running += num
+            if running >= 2 ** 64:
+                raise ValueError(f"Prefix sums overflow 64 bits at {max_digits} digits")
+            prefix.append(running)
+        return cls(ids, prefix, max_digits)
+
+    def save(self, filename):
+        """Write the table as a header followed by the packed ids and prefix sums."""
+        with open(filename, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.max_digits, len(self.ids)))
+            self.ids.tofile(f)
+            self.prefix.tofile(f)
+
+    @classmethod
+    def load(cls, filename):
+        """Memory-map a table written by save() without copying it into memory."""
+        with open(filename, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapped) < cls.HEADER.size:
+            raise ValueError(f"'{filename}' is not an invalid ID table")
+        magic, max_digits, count = cls.HEADER.unpack_from(mapped)
+        if magic != cls.MAGIC:
+            raise ValueError(f"'{filename}' is not an invalid ID table for this rule")
+
+        ids_start = cls.HEADER.size
+        prefix_start = ids_start + 8 * count
+        if len(mapped) != prefix_start + 8 * (count + 1):
+            raise ValueError(f"'{filename}' is truncated or does not match its header")
+
+        view = memoryview(mapped)
+        ids = view[ids_start:prefix_start].cast('Q')
+        prefix = view[prefix_start:prefix_start + 8 * (count + 1)].cast('Q')
+        return cls(ids, prefix, max_digits)
+
+    def sum_in_range(self, start, end):
+        """
+        Count and sum the invalid IDs in [start, end] using two bisects.
+        Returns a (count, total) tuple.
+        """
+        if end >= 10 ** self.max_digits:
+            raise ValueError(f"Range end {end} exceeds the table bound of {self.max_digits} digits")
+
+        lo = bisect_left(self.ids, start)
+        hi = bisect_right(self.ids, end)
+        if lo >= hi:
+            return 0, 0
+        return hi - lo, self.prefix[hi] - self.prefix[lo]
 
 
 def main():
@@ -87,15 +273,12 @@ def main():
     # Parse ranges
     ranges = parse_ranges(input_text)
 
-    # Find all invalid IDs across all ranges
-    all_invalid_ids = []
+    # Sum all invalid IDs across all ranges
+    total = 0
 
     for start, end in ranges:
-        invalid_ids = find_invalid_ids_in_range(start, end)
-        all_invalid_ids.extend(invalid_ids)
-
-    # Calculate the sum
-    total = sum(all_invalid_ids)
+        _, range_total = sum_invalid_ids_in_range(start, end)
+        total += range_total
 
     print(f"Total sum of invalid IDs: {total}")
 
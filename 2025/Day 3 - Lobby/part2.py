@@ -1,54 +1,171 @@
-def find_max_joltage(bank):
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # the batch path needs NumPy, the per-bank path does not
+    np = None
+
+
+class JoltageIndex:
+    """
+    Per-digit next-occurrence index over a battery bank.
+
+    next_occurrence[i][d] is the first position >= i holding digit d (len(bank) if none),
+    so picking the leftmost maximum digit inside any window takes at most ten lookups.
+    The index is built once and answers any number of batteries without recomputing.
     """
-    Find the maximum joltage by selecting exactly 12 batteries from the bank.
 
-    This is equivalent to removing exactly (len(bank) - 12) batteries to maximize
-    the resulting number. We use a monotonic stack algorithm.
+    def __init__(self, bank):
+        self.bank = bank
+        n = len(bank)
+        row = [n] * 10
+        self.next_occurrence = [None] * (n + 1)
+        self.next_occurrence[n] = tuple(row)
+        for i in range(n - 1, -1, -1):
+            row[ord(bank[i]) - 48] = i
+            self.next_occurrence[i] = tuple(row)
+
+    def max_joltage(self, batteries):
+        """
+        Maximum joltage from selecting exactly `batteries` batteries, in order.
+
+        Each output digit is the leftmost maximum digit in the window that still
+        leaves enough batteries to its right for the remaining digits.
+        """
+        n = len(self.bank)
+        if not 0 < batteries <= n:
+            raise ValueError(f"Cannot select {batteries} batteries from a bank of {n}")
+
+        result = 0
+        position = 0
+        for remaining in range(batteries, 0, -1):
+            last_allowed = n - remaining
+            positions = self.next_occurrence[position]
+            for digit in range(9, -1, -1):
+                j = positions[digit]
+                if j <= last_allowed:
+                    result = result * 10 + digit
+                    position = j + 1
+                    break
+
+        return result
+
+
+def find_max_joltage(bank, batteries=12):
+    """
+    Find the maximum joltage by selecting exactly 12 batteries from the bank
+    (or any other number of batteries).
 
     Args:
         bank: A string of digits representing a battery bank
+        batteries: Number of batteries to turn on
 
     Returns:
-        The maximum joltage (12-digit number) possible from this bank
+        The maximum joltage (12-digit number by default) possible from this bank,
+        or every battery's digit when the bank has fewer than `batteries`
     """
-    k = len(bank) - 12  # Number of digits to remove
-    stack = []
-    to_remove = k
+    if len(bank) < batteries:
+        return int(bank)
+    return JoltageIndex(bank).max_joltage(batteries)
 
-    for digit in bank:
-        # While we can still remove digits and current digit is larger than stack top
-        while stack and to_remove > 0 and stack[-1] < digit:
-            stack.pop()
-            to_remove -= 1
-        stack.append(digit)
 
-    # If we still need to remove digits, remove from the end
-    while to_remove > 0:
-        stack.pop()
-        to_remove -= 1
+def bank_matrix(banks):
+    """
+    Pack every bank into one 2-D digit matrix (one row per bank).
+
+    The banks are joined into a single bytes buffer and reinterpreted as uint8
+    without any per-digit parsing. All banks must have the same length.
+    """
+    width = len(banks[0]) if banks else 0
+    if any(len(bank) != width for bank in banks):
+        raise ValueError("All banks must have the same length for batch processing")
 
-    # Convert to integer
-    result = ''.join(stack)
-    return int(result)
+    raw = ''.join(banks).encode('ascii')
+    matrix = np.frombuffer(raw, dtype=np.uint8).reshape(len(banks), width)
+    return (matrix - ord('0')).astype(np.int8)
 
 
-def main():
+def next_occurrence_table(digits):
+    """
+    Vectorized JoltageIndex for a digit matrix: table[i, r, d] is the first
+    position >= i of digit d in bank r, or n if there is none.
+
+    One backward sweep over the columns fills it, each step copying the next
+    position's entries and setting the current digit of every row. The position
+    axis comes first so each step writes one contiguous slab, and the table uses
+    the narrowest unsigned dtype that can hold n.
+    """
+    rows, n = digits.shape
+    dtype = np.uint8 if n < 2 ** 8 else np.uint16 if n < 2 ** 16 else np.uint32
+    table = np.empty((n + 1, rows, 10), dtype=dtype)
+    table[n] = n
+    by_column = np.ascontiguousarray(digits.T)
+    row_offsets = np.arange(rows) * 10
+    for i in range(n - 1, -1, -1):
+        table[i] = table[i + 1]
+        table[i].reshape(-1)[row_offsets + by_column[i]] = i
+    return table
+
+
+def max_joltage_batch(digits, batteries, block_rows=4096):
+    """
+    Maximum joltage of every bank at once, column-wise over a digit matrix.
+
+    Runs the same greedy as JoltageIndex on all rows together: the next-occurrence
+    table is built once, then each step gathers the ten next positions of every
+    row and takes the highest digit that still fits in its window. Rows are
+    processed in blocks of block_rows so the table stays small.
+
+    Returns:
+        An array with one joltage per bank
+    """
+    rows, n = digits.shape
+    if not 0 < batteries <= n:
+        raise ValueError(f"Cannot select {batteries} batteries from banks of {n}")
+
+    # 18 digits still fit in int64; beyond that fall back to Python ints
+    result = np.zeros(rows, dtype=np.int64 if batteries <= 18 else object)
+    for start in range(0, rows, block_rows):
+        table = next_occurrence_table(digits[start:start + block_rows])
+        row_index = np.arange(table.shape[1])
+        position = np.zeros(table.shape[1], dtype=np.int64)
+        joltage = result[start:start + block_rows]
+
+        for remaining in range(batteries, 0, -1):
+            last_allowed = n - remaining
+            candidates = table[position, row_index]
+            # digits run 9 down to 0 after the flip, argmax finds the first that fits
+            digit = 9 - (candidates[:, ::-1] <= last_allowed).argmax(axis=1)
+            joltage *= 10
+            joltage += digit
+            position = candidates[row_index, digit].astype(np.int64) + 1
+
+    return result
+
+
+def main(verbose=True):
     """
     Read the input file and display the maximum joltage for each bank.
     Part 2: Each bank now produces a 12-digit joltage number.
+    Per-bank output is skipped when verbose is False (run with --quiet).
     """
     try:
         with open('input.txt', 'r') as file:
             banks = [line.strip() for line in file if line.strip()]
 
-        print("Part 2 - Maximum joltage (12 batteries) for each bank:")
-        print("=" * 80)
+        # Solve every bank at once when NumPy is available and the banks line up
+        widths = {len(bank) for bank in banks}
+        if np is not None and len(widths) == 1 and min(widths) >= 12:
+            joltages = max_joltage_batch(bank_matrix(banks), 12).tolist()
+        else:
+            joltages = [find_max_joltage(bank) for bank in banks]
 
-        total_joltage = 0
-        for i, bank in enumerate(banks, 1):
-            max_joltage = find_max_joltage(bank)
-            total_joltage += max_joltage
-            print(f"Bank {i}: {max_joltage}")
+        total_joltage = sum(joltages)
+        if verbose:
+            print("Part 2 - Maximum joltage (12 batteries) for each bank:")
+            print("=" * 80)
+            for i, (bank, max_joltage) in enumerate(zip(banks, joltages), 1):
+                print(f"Bank {i}: {max_joltage}")
 
         print("=" * 80)
         print(f"Total banks processed: {len(banks)}")
@@ -61,4 +178,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(verbose="--quiet" not in sys.argv[1:])
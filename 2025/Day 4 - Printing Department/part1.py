@@ -1,31 +1,119 @@
-def count_neighbors(grid, row, col):
-    """Count the number of @ symbols in the 8 adjacent positions."""
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
-
-    # Define all 8 directions: N, S, E, W, NE, NW, SE, SW
-    directions = [
-        (-1, 0),   # North
-        (1, 0),    # South
-        (0, 1),    # East
-        (0, -1),   # West
-        (-1, 1),   # Northeast
-        (-1, -1),  # Northwest
-        (1, 1),    # Southeast
-        (1, -1)    # Southwest
-    ]
-
-    count = 0
-    for dr, dc in directions:
-        new_row = row + dr
-        new_col = col + dc
-
-        # Check bounds
-        if 0 <= new_row < rows and 0 <= new_col < cols:
-            if grid[new_row][new_col] == '@':
-                count += 1
-
-    return count
+import mmap
+import os
+
+
+def to_bitboard(lines):
+    """
+    Convert the grid into one Python int per row, bit `col` set where there is a roll.
+
+    Returns:
+        Tuple of (board, width)
+    """
+    width = max((len(line) for line in lines), default=0)
+    board = [int(line[::-1].replace('@', '1').replace('.', '0') or '0', 2) for line in lines]
+    return board, width
+
+
+def accessible_bitboard(board, width):
+    """
+    For each row, the bitmask of rolls with fewer than 4 neighboring rolls.
+
+    The 8 neighbor planes of a row are shifted copies of the rows above, at and
+    below it. They are summed column-wise with a bit-sliced ripple counter into
+    4 bit planes (counts 0..8); a count is below 4 when its 4 and 8 planes are clear.
+    """
+    full = (1 << width) - 1
+    accessible = []
+
+    for row, bits in enumerate(board):
+        above = board[row - 1] if row > 0 else 0
+        below = board[row + 1] if row + 1 < len(board) else 0
+
+        planes = [0, 0, 0, 0]
+        for neighbor in (above << 1, above, above >> 1,
+                         bits << 1, bits >> 1,
+                         below << 1, below, below >> 1):
+            carry = neighbor & full
+            for i in range(4):
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+                if not carry:
+                    break
+
+        accessible.append(bits & ~(planes[2] | planes[3]))
+
+    return accessible
+
+
+ROW_BITS = bytes.maketrans(b'@.', b'10')
+
+
+def grid_layout(mapped):
+    """
+    Width, row stride and row count of a memory-mapped grid whose lines all have
+    the same length, so any row can be located without scanning the file.
+    Lines may end in LF or CRLF; the width never includes the line ending.
+
+    Returns:
+        Tuple of (width, stride, rows)
+    """
+    newline = mapped.find(b'\n')
+    if newline == -1:
+        width = len(mapped)
+        ending = 1
+    elif newline > 0 and mapped[newline - 1] == ord('\r'):
+        width = newline - 1
+        ending = 2
+    else:
+        width = newline
+        ending = 1
+    stride = width + ending
+
+    # The last line may or may not end with a line ending
+    rows = (len(mapped) + ending) // stride
+    if len(mapped) not in (rows * stride, rows * stride - ending):
+        raise ValueError("All grid lines must have the same length")
+
+    return width, stride, rows
+
+
+def read_bitboard_rows(mapped, stride, width, start, stop):
+    """Read rows [start, stop) of a memory-mapped grid as bitboard rows."""
+    board = []
+    for row in range(start, stop):
+        offset = row * stride
+        bits = mapped[offset:offset + width][::-1].translate(ROW_BITS)
+        board.append(int(bits or b'0', 2))
+    return board
+
+
+def count_accessible_tiled(filename, band_rows=1024):
+    """
+    Count accessible rolls in a grid file too large to load in memory.
+
+    The file is memory-mapped and processed in horizontal bands of band_rows rows,
+    each read with a one-row halo above and below, so only one band of bitboard
+    rows is resident at a time.
+    """
+    if os.path.getsize(filename) == 0:
+        return 0
+
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        width, stride, rows = grid_layout(mapped)
+        accessible_count = 0
+
+        for start in range(0, rows, band_rows):
+            stop = min(start + band_rows, rows)
+            lo = max(start - 1, 0)
+            hi = min(stop + 1, rows)
+
+            board = read_bitboard_rows(mapped, stride, width, lo, hi)
+            accessible = accessible_bitboard(board, width)
+
+            # Skip the halo rows, they belong to the neighboring bands
+            band = accessible[start - lo:stop - lo]
+            accessible_count += sum(mask.bit_count() for mask in band)
+
+        return accessible_count
 
 
 def solve():
@@ -34,20 +122,11 @@ def solve():
     with open('input.txt', 'r') as f:
         lines = f.read().strip().split('\n')
 
-    # Parse the grid
-    grid = [list(line) for line in lines]
+    # Parse the grid into one bitmask per row
+    board, width = to_bitboard(lines)
 
     # Count accessible rolls (rolls with < 4 neighbors)
-    accessible_count = 0
-
-    for row in range(len(grid)):
-        for col in range(len(grid[row])):
-            if grid[row][col] == '@':
-                neighbors = count_neighbors(grid, row, col)
-                if neighbors < 4:
-                    accessible_count += 1
-
-    return accessible_count
+    return sum(mask.bit_count() for mask in accessible_bitboard(board, width))
 
 
 if __name__ == "__main__":
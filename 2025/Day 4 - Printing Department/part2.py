@@ -1,51 +1,247 @@
-def count_neighbors(grid, row, col):
-    """Count the number of @ symbols in the 8 adjacent positions."""
-    rows = len(grid)
-    cols = len(grid[0]) if rows > 0 else 0
-
-    # Define all 8 directions: N, S, E, W, NE, NW, SE, SW
-    directions = [
-        (-1, 0),   # North
-        (1, 0),    # South
-        (0, 1),    # East
-        (0, -1),   # West
-        (-1, 1),   # Northeast
-        (-1, -1),  # Northwest
-        (1, 1),    # Southeast
-        (1, -1)    # Southwest
-    ]
-
-    count = 0
-    for dr, dc in directions:
-        new_row = row + dr
-        new_col = col + dc
-
-        # Check bounds
-        if 0 <= new_row < rows and 0 <= new_col < cols:
-            if grid[new_row][new_col] == '@':
-                count += 1
-
-    return count
-
-
-def find_accessible_rolls(grid):
-    """Find all accessible rolls (rolls with < 4 neighbors) in the current grid."""
+import mmap
+import os
+import shutil
+import tempfile
+
+
+def peel_rolls(lines):
+    """
+    Remove accessible rolls round by round, like a k-core peeling.
+
+    Neighbor counts are computed once into a flat array (with a one-cell border so
+    no bounds checks are needed). Removing a roll decrements its neighbors, and any
+    neighbor dropping below 4 is queued for the next round, so the total work is
+    proportional to the number of cells, however many rounds there are.
+
+    Returns:
+        List with the number of rolls removed in each round
+    """
+    rows = len(lines)
+    cols = max((len(line) for line in lines), default=0)
+    width = cols + 2
+
+    present = bytearray(width * (rows + 2))
+    for row, line in enumerate(lines):
+        base = (row + 1) * width + 1
+        for col, cell in enumerate(line):
+            if cell == '@':
+                present[base + col] = 1
+
+    offsets = (-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1)
+
+    neighbors = [0] * len(present)
+    queued = bytearray(len(present))
+    current_round = []
+    for cell, is_roll in enumerate(present):
+        if is_roll:
+            count = sum(present[cell + offset] for offset in offsets)
+            neighbors[cell] = count
+            if count < 4:
+                queued[cell] = 1
+                current_round.append(cell)
+
+    removed_per_round = []
+    while current_round:
+        # Remove the whole round first, as if all rolls were taken at once
+        for cell in current_round:
+            present[cell] = 0
+
+        next_round = []
+        for cell in current_round:
+            for offset in offsets:
+                other = cell + offset
+                if present[other]:
+                    neighbors[other] -= 1
+                    if neighbors[other] < 4 and not queued[other]:
+                        queued[other] = 1
+                        next_round.append(other)
+
+        removed_per_round.append(len(current_round))
+        current_round = next_round
+
+    return removed_per_round
+
+
+def to_bitboard(lines):
+    """
+    Convert the grid into one Python int per row, bit `col` set where there is a roll.
+
+    Returns:
+        Tuple of (board, width)
+    """
+    width = max((len(line) for line in lines), default=0)
+    board = [int(line[::-1].replace('@', '1').replace('.', '0') or '0', 2) for line in lines]
+    return board, width
+
+
+def accessible_bitboard(board, width):
+    """
+    For each row, the bitmask of rolls with fewer than 4 neighboring rolls.
+
+    The 8 neighbor planes of a row are shifted copies of the rows above, at and
+    below it. They are summed column-wise with a bit-sliced ripple counter into
+    4 bit planes (counts 0..8); a count is below 4 when its 4 and 8 planes are clear.
+    """
+    full = (1 << width) - 1
     accessible = []
 
-    for row in range(len(grid)):
-        for col in range(len(grid[row])):
-            if grid[row][col] == '@':
-                neighbors = count_neighbors(grid, row, col)
-                if neighbors < 4:
-                    accessible.append((row, col))
+    for row, bits in enumerate(board):
+        above = board[row - 1] if row > 0 else 0
+        below = board[row + 1] if row + 1 < len(board) else 0
+
+        planes = [0, 0, 0, 0]
+        for neighbor in (above << 1, above, above >> 1,
+                         bits << 1, bits >> 1,
+                         below << 1, below, below >> 1):
+            carry = neighbor & full
+            for i in range(4):
+                planes[i], carry = planes[i] ^ carry, planes[i] & carry
+                if not carry:
+                    break
+
+        accessible.append(bits & ~(planes[2] | planes[3]))
 
     return accessible
 
 
-def remove_rolls(grid, positions):
-    """Remove rolls at the specified positions by replacing them with '.'"""
-    for row, col in positions:
-        grid[row][col] = '.'
+def peel_rolls_bitboard(lines):
+    """
+    Same rounds as peel_rolls, but with each round computed on the bitboard:
+    a handful of shifts and bitwise operations per row instead of per cell.
+
+    Returns:
+        List with the number of rolls removed in each round
+    """
+    board, width = to_bitboard(lines)
+    removed_per_round = []
+
+    while True:
+        accessible = accessible_bitboard(board, width)
+        removed = sum(mask.bit_count() for mask in accessible)
+        if not removed:
+            break
+
+        board = [bits & ~mask for bits, mask in zip(board, accessible)]
+        removed_per_round.append(removed)
+
+    return removed_per_round
+
+
+ROW_BITS = bytes.maketrans(b'@.', b'10')
+
+
+def grid_layout(mapped):
+    """
+    Width, row stride and row count of a memory-mapped grid whose lines all have
+    the same length, so any row can be located without scanning the file.
+    Lines may end in LF or CRLF; the width never includes the line ending.
+
+    Returns:
+        Tuple of (width, stride, rows)
+    """
+    newline = mapped.find(b'\n')
+    if newline == -1:
+        width = len(mapped)
+        ending = 1
+    elif newline > 0 and mapped[newline - 1] == ord('\r'):
+        width = newline - 1
+        ending = 2
+    else:
+        width = newline
+        ending = 1
+    stride = width + ending
+
+    # The last line may or may not end with a line ending
+    rows = (len(mapped) + ending) // stride
+    if len(mapped) not in (rows * stride, rows * stride - ending):
+        raise ValueError("All grid lines must have the same length")
+
+    return width, stride, rows
+
+
+def read_bitboard_rows(mapped, stride, width, start, stop):
+    """Read rows [start, stop) of a memory-mapped grid as bitboard rows."""
+    board = []
+    for row in range(start, stop):
+        offset = row * stride
+        bits = mapped[offset:offset + width][::-1].translate(ROW_BITS)
+        board.append(int(bits or b'0', 2))
+    return board
+
+
+def remove_rolls_tiled(filename, band_rows=1024, work_filename=None):
+    """
+    Iterative roll removal on a grid file too large to load in memory.
+
+    The grid is copied to a work file (a temporary file unless work_filename is
+    given) that is memory-mapped and updated in place, one band of band_rows rows
+    at a time with a one-row halo. Within a round, the original state of a band's
+    last row is kept as the halo of the next band, so every band still sees the
+    grid as it was at the start of the round. Only bands that changed, and their
+    neighbors, are revisited in the next round.
+
+    Returns:
+        List with the number of rolls removed in each round
+    """
+    cleanup = work_filename is None
+    if cleanup:
+        fd, work_filename = tempfile.mkstemp(suffix='.grid', dir=os.path.dirname(os.path.abspath(filename)))
+        os.close(fd)
+
+    try:
+        shutil.copyfile(filename, work_filename)
+        if os.path.getsize(work_filename) == 0:
+            return []
+
+        with open(work_filename, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mapped:
+            width, stride, rows = grid_layout(mapped)
+            band_count = (rows + band_rows - 1) // band_rows
+            dirty = set(range(band_count))
+            removed_per_round = []
+
+            while dirty:
+                removed = 0
+                changed = set()
+                previous_band = None
+                previous_last_row = 0
+
+                for band in sorted(dirty):
+                    start = band * band_rows
+                    stop = min(start + band_rows, rows)
+                    lo = max(start - 1, 0)
+                    hi = min(stop + 1, rows)
+
+                    board = read_bitboard_rows(mapped, stride, width, lo, hi)
+                    if start > 0 and previous_band == band - 1:
+                        # The row above was already updated this round, use its original state
+                        board[0] = previous_last_row
+                    previous_band = band
+                    previous_last_row = board[stop - 1 - lo]
+
+                    accessible = accessible_bitboard(board, width)
+                    for row in range(start, stop):
+                        mask = accessible[row - lo]
+                        if not mask:
+                            continue
+                        removed += mask.bit_count()
+                        changed.add(band)
+
+                        offset = row * stride
+                        while mask:
+                            lowest = mask & -mask
+                            mapped[offset + lowest.bit_length() - 1] = ord('.')
+                            mask ^= lowest
+
+                if not removed:
+                    break
+
+                removed_per_round.append(removed)
+                dirty = {b + d for b in changed for d in (-1, 0, 1) if 0 <= b + d < band_count}
+
+            return removed_per_round
+    finally:
+        if cleanup:
+            os.remove(work_filename)
 
 
 def solve():
@@ -54,27 +250,14 @@ def solve():
     with open('input.txt', 'r') as f:
         lines = f.read().strip().split('\n')
 
-    # Parse the grid (make it mutable)
-    grid = [list(line) for line in lines]
-
     total_removed = 0
 
     # Keep removing accessible rolls until no more can be removed
-    while True:
-        # Find all accessible rolls in current state
-        accessible = find_accessible_rolls(grid)
-
-        # If no more accessible rolls, stop
-        if not accessible:
-            break
-
-        # Remove all accessible rolls
-        remove_rolls(grid, accessible)
-
+    for removed in peel_rolls(lines):
         # Update total count
-        total_removed += len(accessible)
+        total_removed += removed
 
-        print(f"Removed {len(accessible)} rolls (total: {total_removed})")
+        print(f"Removed {removed} rolls (total: {total_removed})")
 
     return total_removed
 
@@ -1,3 +1,7 @@
+from array import array
+from bisect import bisect_right
+
+
 def is_fresh(ingredient_id, fresh_ranges):
     """Check if an ingredient ID falls within any of the fresh ranges."""
     for start, end in fresh_ranges:
@@ -6,6 +10,67 @@ def is_fresh(ingredient_id, fresh_ranges):
     return False
 
 
+def merge_ranges(ranges):
+    """Merge overlapping ranges and return a list of non-overlapping ranges."""
+    if not ranges:
+        return []
+
+    # Sort ranges by start value
+    sorted_ranges = sorted(ranges)
+
+    merged = [sorted_ranges[0]]
+
+    for current_start, current_end in sorted_ranges[1:]:
+        last_start, last_end = merged[-1]
+
+        # Check if current range overlaps or is adjacent to the last merged range
+        if current_start <= last_end + 1:
+            # Merge the ranges by extending the end if necessary
+            merged[-1] = (last_start, max(last_end, current_end))
+        else:
+            # No overlap, add as a new range
+            merged.append((current_start, current_end))
+
+    return merged
+
+
+class FreshIndex:
+    """
+    Membership index over merged fresh ranges, stored as two packed sorted arrays.
+
+    Single lookups are a bisect on the range starts; a sorted batch of IDs is
+    answered with one linear merge-join over the ranges.
+    """
+
+    def __init__(self, fresh_ranges):
+        merged = merge_ranges(fresh_ranges)
+        self.starts = array('q', (start for start, _ in merged))
+        self.ends = array('q', (end for _, end in merged))
+
+    def __contains__(self, ingredient_id):
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+
+    def count_fresh_sorted(self, sorted_ids):
+        """Count fresh IDs in an already sorted list with a single merge-join."""
+        count = 0
+        i = 0
+        n = len(self.starts)
+        for ingredient_id in sorted_ids:
+            # Skip ranges that end before this ID; later IDs are even larger
+            while i < n and self.ends[i] < ingredient_id:
+                i += 1
+            if i == n:
+                break
+            if self.starts[i] <= ingredient_id:
+                count += 1
+        return count
+
+    def count_fresh(self, ingredient_ids):
+        """Count fresh IDs in any order."""
+        return self.count_fresh_sorted(sorted(ingredient_ids))
+
+
 def main():
     # Read the input file
     with open('input.txt', 'r') as file:
@@ -28,10 +93,7 @@ def main():
         ingredient_ids.append(int(lines[i]))
 
     # Count how many ingredient IDs are fresh
-    fresh_count = 0
-    for ingredient_id in ingredient_ids:
-        if is_fresh(ingredient_id, fresh_ranges):
-            fresh_count += 1
+    fresh_count = FreshIndex(fresh_ranges).count_fresh(ingredient_ids)
 
     print(f"Number of fresh ingredient IDs: {fresh_count}")
 
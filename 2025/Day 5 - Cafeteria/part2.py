@@ -1,3 +1,6 @@
+import random
+
+
 def merge_ranges(ranges):
     """Merge overlapping ranges and return a list of non-overlapping ranges."""
     if not ranges:
@@ -31,6 +34,142 @@ def count_fresh_ids(ranges):
     return total
 
 
+class _IntervalNode:
+    """Treap node holding one disjoint fresh range and the IDs covered by its subtree."""
+
+    __slots__ = ('start', 'end', 'priority', 'left', 'right', 'covered')
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.covered = end - start + 1
+
+
+def _covered(node):
+    return node.covered if node else 0
+
+
+def _update(node):
+    node.covered = node.end - node.start + 1 + _covered(node.left) + _covered(node.right)
+
+
+def _split(node, goes_left):
+    """
+    Split a treap into (nodes for which goes_left is True, the rest).
+    goes_left must be True for a prefix of the ranges in order and False afterwards.
+    """
+    if node is None:
+        return None, None
+    if goes_left(node):
+        left, right = _split(node.right, goes_left)
+        node.right = left
+        _update(node)
+        return node, right
+    left, right = _split(node.left, goes_left)
+    node.left = right
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    """Merge two treaps where every range of left comes before every range of right."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _leftmost(node):
+    while node.left:
+        node = node.left
+    return node
+
+
+def _rightmost(node):
+    while node.right:
+        node = node.right
+    return node
+
+
+class FreshIntervalSet:
+    """
+    Dynamic set of fresh IDs kept as disjoint, non-adjacent ranges in a treap.
+
+    Adding or removing a range and membership queries take O(log n) amortized
+    (each stored range is absorbed or cut at most once), and the total number of
+    fresh IDs is maintained in the root after every update.
+    """
+
+    def __init__(self, ranges=()):
+        self.root = None
+        for start, end in ranges:
+            self.add(start, end)
+
+    def add(self, start, end):
+        """Mark every ID in [start, end] as fresh."""
+        # Ranges overlapping or adjacent to [start, end] are absorbed into it
+        left, right = _split(self.root, lambda node: node.start <= end + 1)
+        left, absorbed = _split(left, lambda node: node.end < start - 1)
+        if absorbed:
+            start = min(start, _leftmost(absorbed).start)
+            end = max(end, _rightmost(absorbed).end)
+        self.root = _merge(_merge(left, _IntervalNode(start, end)), right)
+
+    def remove(self, start, end):
+        """Mark every ID in [start, end] as no longer fresh."""
+        left, right = _split(self.root, lambda node: node.start <= end)
+        left, cut = _split(left, lambda node: node.end < start)
+        if cut:
+            # Keep whatever sticks out on either side of the removed range
+            first = _leftmost(cut)
+            last = _rightmost(cut)
+            if first.start < start:
+                left = _merge(left, _IntervalNode(first.start, start - 1))
+            if last.end > end:
+                right = _merge(_IntervalNode(end + 1, last.end), right)
+        self.root = _merge(left, right)
+
+    def __contains__(self, ingredient_id):
+        node = self.root
+        while node:
+            if ingredient_id < node.start:
+                node = node.left
+            elif ingredient_id > node.end:
+                node = node.right
+            else:
+                return True
+        return False
+
+    @property
+    def total(self):
+        """Total number of fresh IDs, as count_fresh_ids would report it."""
+        return _covered(self.root)
+
+    def ranges(self):
+        """The disjoint fresh ranges, in increasing order."""
+        result = []
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append((node.start, node.end))
+            node = node.right
+        return result
+
+
 def main():
     # Read the input file
     with open('input.txt', 'r') as file:
@@ -7,51 +7,175 @@ pour chaque problème, calcule le résultat (+ ou *) puis affiche la somme total
 """
 from pathlib import Path
 import math
+import re
 import sys
 
 INPUT = Path(__file__).with_name("input.txt")
+# below this many operands a left-to-right product is already fast enough
+PRODUCT_TREE_THRESHOLD = 64
+# files at least this large are streamed instead of being parsed in memory
+STREAM_MIN_BYTES = 1 << 26
 
 
-def read_lines(path: Path):
-    if not path.exists():
-        print(f"input file not found: {path}")
-        sys.exit(1)
-    # keep trailing spaces per line (splitlines preserves spaces)
-    return path.read_text(encoding="utf-8").splitlines()
-
-
-def find_nonempty_column_ranges(lines):
-    if not lines:
-        return []
-    maxlen = max(len(line) for line in lines)
-    padded = [line.ljust(maxlen) for line in lines]
-    # a column is a separator if every line has a space at that column
-    is_separator = [all(row[col] == ' ' for row in padded) for col in range(maxlen)]
-    ranges = []
-    in_range = False
+class Worksheet:
+    """
+    Worksheet kept as raw byte rows, all padded to the same width.
+
+    Separator columns are found in one bytewise pass: every row is XORed with a
+    row of spaces and the rows are ORed together as big integers, so a zero byte
+    in the result marks a column that is blank on every row. Blocks are then read
+    through zero-copy memoryview slices of the rows.
+    """
+
+    def __init__(self, data: bytes):
+        lines = data.splitlines()
+        self.width = max((len(line) for line in lines), default=0)
+        self.rows = [line.ljust(self.width) for line in lines]
+        self.views = [memoryview(row) for row in self.rows]
+
+        spaces = int.from_bytes(b' ' * self.width, 'big')
+        combined = 0
+        for row in self.rows:
+            combined |= int.from_bytes(row, 'big') ^ spaces
+        mask = combined.to_bytes(self.width, 'big')
+        self.blocks = [(m.start(), m.end() - 1) for m in re.finditer(rb'[^\x00]+', mask)]
+
+    def block_rows(self, lo, hi):
+        """Zero-copy slices of every row over columns lo..hi (inclusive)."""
+        return [view[lo:hi + 1] for view in self.views]
+
+
+def row_extents(path: Path, chunk_size=1 << 20):
+    """(offset, length) of every line, found by scanning the file in chunks."""
+    extents = []
     start = 0
-    for i, sep in enumerate(is_separator):
-        if not sep and not in_range:
-            in_range = True
-            start = i
-        elif sep and in_range:
-            in_range = False
-            ranges.append((start, i - 1))
-    if in_range:
-        ranges.append((start, maxlen - 1))
-    return ranges, padded
-
-
-def parse_block(padded_lines, lo, hi):
+    pos = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            i = chunk.find(b'\n')
+            while i != -1:
+                end = pos + i
+                extents.append((start, end - start))
+                start = end + 1
+                i = chunk.find(b'\n', i + 1)
+            pos += len(chunk)
+    if pos > start:
+        extents.append((start, pos - start))
+    return extents
+
+
+def stream_blocks(path: Path, window=1 << 16):
+    """
+    Yield (lo, hi, rows) for each problem block without loading whole lines.
+
+    One file cursor is opened per row and all of them advance together, `window`
+    columns at a time. Separator columns inside a window are found with the same
+    XOR/OR mask as Worksheet, and a block is yielded as soon as its closing
+    separator is read, so memory depends on the widest block, not on line length.
+    """
+    extents = row_extents(path)
+    if not extents:
+        return
+    width = max(length for _, length in extents)
+
+    files = [open(path, 'rb') for _ in extents]
+    try:
+        for f, (offset, _) in zip(files, extents):
+            f.seek(offset)
+
+        block_lo = None
+        pending = []
+        for col in range(0, width, window):
+            size = min(window, width - col)
+            chunks = []
+            for f, (_, length) in zip(files, extents):
+                want = max(0, min(size, length - col))
+                data = f.read(want) if want else b''
+                chunks.append(data.replace(b'\r', b' ').ljust(size))
+
+            spaces = int.from_bytes(b' ' * size, 'big')
+            combined = 0
+            for chunk in chunks:
+                combined |= int.from_bytes(chunk, 'big') ^ spaces
+            mask = combined.to_bytes(size, 'big')
+            runs = [(m.start(), m.end()) for m in re.finditer(rb'[^\x00]+', mask)]
+
+            # the block left open by the previous window ends if this one starts on a separator
+            if block_lo is not None and (not runs or runs[0][0] > 0):
+                yield block_lo, block_lo + len(pending[0]) - 1, [bytes(p) for p in pending]
+                block_lo = None
+
+            for s, e in runs:
+                if block_lo is None:
+                    block_lo = col + s
+                    pending = [bytearray() for _ in chunks]
+                for p, chunk in zip(pending, chunks):
+                    p += chunk[s:e]
+                # a run reaching the window edge may continue in the next window
+                if e < size:
+                    yield block_lo, col + e - 1, [bytes(p) for p in pending]
+                    block_lo = None
+
+        if block_lo is not None:
+            yield block_lo, block_lo + len(pending[0]) - 1, [bytes(p) for p in pending]
+    finally:
+        for f in files:
+            f.close()
+
+
+def read_blocks(path: Path):
+    """
+    Yield (lo, hi, rows) for each problem block: through Worksheet when the file
+    fits comfortably in memory, otherwise with stream_blocks.
+    """
+    if path.stat().st_size < STREAM_MIN_BYTES:
+        sheet = Worksheet(path.read_bytes())
+        for lo, hi in sheet.blocks:
+            yield lo, hi, sheet.block_rows(lo, hi)
+    else:
+        yield from stream_blocks(path)
+
+
+def parse_block(rows):
     tokens = []
-    for row in padded_lines:
-        s = row[lo:hi+1].strip()
+    for row in rows:
+        s = bytes(row).strip()
         if s:
-            tokens.append(s)
+            tokens.append(s.decode('ascii'))
     return tokens
 
 
-def compute_from_tokens(tokens):
+def product_tree(values):
+    """
+    Multiply values pairwise in a balanced tree, so big operands are combined with
+    others of similar size instead of growing one huge accumulator.
+    """
+    values = list(values)
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def multiply(values, modulus=None):
+    if modulus is not None:
+        result = 1
+        for v in values:
+            result = result * v % modulus
+        return result
+    if len(values) >= PRODUCT_TREE_THRESHOLD:
+        return product_tree(values)
+    return math.prod(values)
+
+
+def compute_from_tokens(tokens, modulus=None):
     if not tokens:
         raise ValueError("empty block")
     op = tokens[-1].strip()
@@ -63,34 +187,55 @@ def compute_from_tokens(tokens):
     except ValueError as e:
         raise ValueError(f"failed to parse integer in tokens {nums}") from e
     if op == '+':
-        return sum(values)
+        total = sum(values)
+        return total if modulus is None else total % modulus
     elif op == '*':
-        return math.prod(values)
+        return multiply(values, modulus)
     else:
         raise ValueError(f"unknown operator: {op}")
 
 
-def main():
-    lines = read_lines(INPUT)
-    ranges, padded = find_nonempty_column_ranges(lines)
-    if not ranges:
-        print("no problems found")
-        return
+def parse_modulus(argv):
+    """Optional `--mod P`: compute every result and the grand total modulo P."""
+    if '--mod' not in argv:
+        return None
+    i = argv.index('--mod')
+    try:
+        modulus = int(argv[i + 1])
+    except (IndexError, ValueError):
+        print("--mod expects an integer modulus")
+        sys.exit(1)
+    if modulus < 2:
+        print("--mod expects a modulus of at least 2")
+        sys.exit(1)
+    return modulus
+
+
+def main(modulus=None):
+    if not INPUT.exists():
+        print(f"input file not found: {INPUT}")
+        sys.exit(1)
+    found = False
     total = 0
-    for lo, hi in ranges:
-        tokens = parse_block(padded, lo, hi)
+    for lo, hi, rows in read_blocks(INPUT):
+        found = True
+        tokens = parse_block(rows)
         # ignore any trailing meta lines that might not be numbers/operators
         if not tokens:
             continue
         try:
-            val = compute_from_tokens(tokens)
+            val = compute_from_tokens(tokens, modulus)
         except Exception as e:
             print(f"skipping block {lo}-{hi}: {e}")
             continue
         total += val
+        if modulus is not None:
+            total %= modulus
+    if not found:
+        print("no problems found")
+        return
     print(total)
 
 
 if __name__ == '__main__':
-    main()
-
+    main(parse_modulus(sys.argv[1:]))
@@ -14,49 +14,60 @@ def read_grid(path: Path):
     return grid
 
 
-def count_splits(grid):
+def find_start(grid):
+    for r, row in enumerate(grid):
+        for c, ch in enumerate(row):
+            if ch == 'S':
+                return r, c
+    raise ValueError("No start position 'S' found in input")
+
+
+def index_splitters(grid, start_r=0):
+    """List of (row, splitter columns) below start_r, skipping rows without splitters."""
+    indexed = []
+    for r in range(start_r + 1, len(grid)):
+        cols = [c for c, ch in enumerate(grid[r]) if ch == '^']
+        if cols:
+            indexed.append((r, cols))
+    return indexed
+
+
+def propagate_beams(grid):
+    """
+    Propagate the beam from 'S' down the manifold in a single pass.
+
+    Beam state is a dense array of timeline counts per column. Rows without
+    splitters leave it unchanged, so only the indexed splitter rows are visited
+    and the cost is proportional to the number of splitters.
+
+    Returns:
+        Tuple of (splits, timelines): distinct splitters hit (part 1) and the
+        number of timelines reaching the bottom (part 2)
+    """
     if not grid:
-        return 0
-    R = len(grid)
+        return 0, 0
     C = len(grid[0])
-    start_r = start_c = None
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == 'S':
-                start_r, start_c = r, c
-                break
-        if start_r is not None:
-            break
-    if start_r is None:
-        raise ValueError("No start position 'S' found in input")
-
-    beams = {start_c}
+    start_r, start_c = find_start(grid)
+
+    counts = [0] * C
+    counts[start_c] = 1
     splits = 0
-    r = start_r
-    # propagate until bottom or no active beams
-    while beams and r < R - 1:
-        nr = r + 1
-        next_beams = set()
-        received = set()
-        for c in beams:
-            if c < 0 or c >= C:
-                continue
-            ch = grid[nr][c]
-            if ch == '^':
-                received.add(c)
-            else:
-                # any non-splitter cell lets the beam pass
-                next_beams.add(c)
-        # splitters emit beams to immediate left and right on the same row (nr)
-        for c in received:
+    for _, cols in index_splitters(grid, start_r):
+        # take every incoming beam first so beams emitted on this row are not split again
+        incoming = [(c, counts[c]) for c in cols if counts[c]]
+        for c, _ in incoming:
+            counts[c] = 0
+        for c, cnt in incoming:
             if c - 1 >= 0:
-                next_beams.add(c - 1)
+                counts[c - 1] += cnt
             if c + 1 < C:
-                next_beams.add(c + 1)
-        splits += len(received)
-        beams = next_beams
-        r = nr
-    return splits
+                counts[c + 1] += cnt
+        splits += len(incoming)
+    return splits, sum(counts)
+
+
+def count_splits(grid):
+    return propagate_beams(grid)[0]
 
 
 def main():
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 from pathlib import Path
 import sys
-from collections import defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # the vectorized kernel needs NumPy, the pure-Python engine does not
+    np = None
+
+# grids at least this wide go through the NumPy row kernel when it is available
+VECTORIZE_MIN_WIDTH = 2048
 
 
 def read_grid(path: Path):
@@ -14,50 +21,158 @@ def read_grid(path: Path):
     return grid
 
 
-def count_timelines(grid):
+def find_start(grid):
+    for r, row in enumerate(grid):
+        for c, ch in enumerate(row):
+            if ch == 'S':
+                return r, c
+    raise ValueError("No start position 'S' found in input")
+
+
+def index_splitters(grid, start_r=0):
+    """List of (row, splitter columns) below start_r, skipping rows without splitters."""
+    indexed = []
+    for r in range(start_r + 1, len(grid)):
+        cols = [c for c, ch in enumerate(grid[r]) if ch == '^']
+        if cols:
+            indexed.append((r, cols))
+    return indexed
+
+
+def propagate_beams(grid):
+    """
+    Propagate the beam from 'S' down the manifold in a single pass.
+
+    Beam state is a dense array of timeline counts per column. Rows without
+    splitters leave it unchanged, so only the indexed splitter rows are visited
+    and the cost is proportional to the number of splitters.
+
+    Returns:
+        Tuple of (splits, timelines): distinct splitters hit (part 1) and the
+        number of timelines reaching the bottom (part 2)
+    """
     if not grid:
-        return 0
-    R = len(grid)
+        return 0, 0
     C = len(grid[0])
-    start_r = start_c = None
-    for r in range(R):
-        for c in range(C):
-            if grid[r][c] == 'S':
-                start_r, start_c = r, c
-                break
-        if start_r is not None:
-            break
-    if start_r is None:
-        raise ValueError("No start position 'S' found in input")
-
-    # beams: mapping column -> number of timelines currently at that column on current row
-    beams = defaultdict(int)
-    beams[start_c] = 1
-    r = start_r
-    # propagate until bottom or no active beams
-    while beams and r < R - 1:
-        nr = r + 1
-        next_beams = defaultdict(int)
-        received = defaultdict(int)  # splitter column -> total number of beams hitting it this step
-        for c, cnt in list(beams.items()):
-            if c < 0 or c >= C:
-                continue
-            ch = grid[nr][c]
-            if ch == '^':
-                received[c] += cnt
-            else:
-                next_beams[c] += cnt
-        # each beam hitting a splitter spawns one left and one right beam
-        for c, cnt in received.items():
+    start_r, start_c = find_start(grid)
+
+    counts = [0] * C
+    counts[start_c] = 1
+    splits = 0
+    for _, cols in index_splitters(grid, start_r):
+        # take every incoming beam first so beams emitted on this row are not split again
+        incoming = [(c, counts[c]) for c in cols if counts[c]]
+        for c, _ in incoming:
+            counts[c] = 0
+        for c, cnt in incoming:
             if c - 1 >= 0:
-                next_beams[c - 1] += cnt
+                counts[c - 1] += cnt
             if c + 1 < C:
-                next_beams[c + 1] += cnt
-        beams = next_beams
-        r = nr
-    # total number of timelines is sum of counts of beams remaining
-    total = sum(beams.values())
-    return total
+                counts[c + 1] += cnt
+        splits += len(incoming)
+    return splits, sum(counts)
+
+
+def propagate_beams_vectorized(grid, modulus=None):
+    """
+    NumPy version of propagate_beams for very wide manifolds.
+
+    Each splitter row is one array transition: the counts under the splitter mask
+    are taken out, then added back shifted one column left and one column right.
+    Counts use object dtype (exact big ints), or int64 reduced modulo `modulus`
+    when one is given. Splits are tracked on a separate boolean reachability
+    vector, so they stay exact in modular mode. The modulus is capped at 2**62
+    because a count plus one shifted hit must still fit in int64 before reduction.
+
+    Returns:
+        Tuple of (splits, timelines), timelines modulo `modulus` if given
+    """
+    if not grid:
+        return 0, 0
+    start_r, start_c = find_start(grid)
+    cells = np.frombuffer(''.join(''.join(row) for row in grid).encode('ascii'), dtype=np.uint8)
+    splitters = cells.reshape(len(grid), -1)[start_r + 1:] == ord('^')
+    C = splitters.shape[1]
+
+    if modulus is not None and not 1 < modulus < 2 ** 62:
+        raise ValueError("modulus must be between 2 and 2**62 for int64 counts")
+    counts = np.zeros(C, dtype=object if modulus is None else np.int64)
+    counts[start_c] = 1
+    reached = np.zeros(C, dtype=bool)
+    reached[start_c] = True
+
+    splits = 0
+    for mask in splitters[splitters.any(axis=1)]:
+        hit = np.where(mask, counts, 0)
+        counts = np.where(mask, 0, counts)
+        # reduce after each shifted add so int64 counts never exceed 2 * (modulus - 1)
+        counts[:-1] += hit[1:]
+        if modulus is not None:
+            counts %= modulus
+        counts[1:] += hit[:-1]
+        if modulus is not None:
+            counts %= modulus
+
+        reached_hit = reached & mask
+        splits += int(np.count_nonzero(reached_hit))
+        reached = reached & ~mask
+        reached[:-1] |= reached_hit[1:]
+        reached[1:] |= reached_hit[:-1]
+
+    timelines = counts.sum(dtype=object)  # exact, int64 column sums could overflow
+    return splits, int(timelines if modulus is None else timelines % modulus)
+
+
+def count_timelines(grid):
+    if np is not None and grid and len(grid[0]) >= VECTORIZE_MIN_WIDTH:
+        return propagate_beams_vectorized(grid)[1]
+    return propagate_beams(grid)[1]
+
+
+class TimelineTable:
+    """
+    Timelines reaching the bottom edge from every cell, built by one bottom-up pass.
+
+    A beam's future only changes when it reaches a splitter row, so the table keeps
+    one count array per splitter row: counts[k][c] is the number of timelines for a
+    beam in column c just above splitter row k. next_splitter[r] gives the first
+    splitter row below row r, which makes every query O(1).
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        R = len(grid)
+        C = len(grid[0]) if grid else 0
+        splitter_rows = index_splitters(grid, -1)
+
+        below = [1] * C  # below the last splitter row every beam is one timeline
+        self.counts = [None] * len(splitter_rows)
+        for k in range(len(splitter_rows) - 1, -1, -1):
+            row = list(below)
+            for c in splitter_rows[k][1]:
+                left = below[c - 1] if c - 1 >= 0 else 0
+                right = below[c + 1] if c + 1 < C else 0
+                row[c] = left + right
+            self.counts[k] = row
+            below = row
+
+        self.next_splitter = [0] * R
+        k = len(splitter_rows)
+        for r in range(R - 1, -1, -1):
+            self.next_splitter[r] = k
+            if k > 0 and splitter_rows[k - 1][0] == r:
+                k -= 1
+
+    def timelines_from(self, r, c):
+        """Timelines reaching the bottom for a beam starting at row r, column c."""
+        k = self.next_splitter[r]
+        return self.counts[k][c] if k < len(self.counts) else 1
+
+    def timelines_from_markers(self):
+        """Total timelines when every 'S' in the grid emits a beam."""
+        return sum(self.timelines_from(r, c)
+                   for r, row in enumerate(self.grid)
+                   for c, ch in enumerate(row) if ch == 'S')
 
 
 def main():
@@ -11,13 +11,39 @@ This script is robust to empty lines and ignores malformed lines.
 
 import os
 import heapq
-from collections import Counter
+import math
+from array import array
+from collections import Counter, defaultdict
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # the vectorized path needs NumPy, the grid index does not
+    np = None
+
+# up to this many points the blocked NumPy scan beats the lazy grid index
+VECTORIZE_MAX_POINTS = 2000
+# 3 / (2 pi): cell occupancy at the radius holding k pairs, see cell_occupancy
+PAIRS_PER_RADIUS_CELL = 3 / (2 * math.pi)
+# relative cost of opening a neighbor cell against checking a same-cell pair,
+# tuned on uniformly random points
+CELL_COST_RATIO = 32
 
 
 class UnionFind:
+    """
+    Union by size over compact array('i') storage.
+
+    Besides the number of components, a live multiset of component sizes
+    (size -> how many components have it) is kept up to date by every union,
+    so the largest components can be read at any point of the edge stream.
+    """
+
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
+        self.count = n
+        self.size_counts = Counter({1: n}) if n else Counter()
 
     def find(self, x):
         while self.parent[x] != x:
@@ -30,15 +56,45 @@ class UnionFind:
         ry = self.find(y)
         if rx == ry:
             return False
-        if self.rank[rx] < self.rank[ry]:
-            self.parent[rx] = ry
-        elif self.rank[ry] < self.rank[rx]:
-            self.parent[ry] = rx
-        else:
-            self.parent[ry] = rx
-            self.rank[rx] += 1
+        if self.size[rx] < self.size[ry]:
+            rx, ry = ry, rx
+        for s in (self.size[rx], self.size[ry]):
+            self.size_counts[s] -= 1
+            if not self.size_counts[s]:
+                del self.size_counts[s]
+        self.parent[ry] = rx
+        self.size[rx] += self.size[ry]
+        self.size_counts[self.size[rx]] += 1
+        self.count -= 1
         return True
 
+    def largest_sizes(self, k):
+        """Sizes of the k largest components, largest first."""
+        sizes = []
+        for s in sorted(self.size_counts, reverse=True):
+            sizes.extend([s] * min(self.size_counts[s], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
+
+    def product_of_largest(self, k=3):
+        """Product of the k largest component sizes (of all of them if fewer)."""
+        prod = 1
+        for s in self.largest_sizes(k):
+            prod *= s
+        return prod
+
+    def snapshot(self):
+        """Copy of the current state, to be handed back to restore()."""
+        return array('i', self.parent), array('i', self.size), self.count, Counter(self.size_counts)
+
+    def restore(self, snapshot):
+        parent, size, count, size_counts = snapshot
+        self.parent = array('i', parent)
+        self.size = array('i', size)
+        self.count = count
+        self.size_counts = Counter(size_counts)
+
 
 def load_points(path):
     pts = []
@@ -61,24 +117,226 @@ def load_points(path):
     return pts
 
 
-def k_smallest_edges(points, k):
-    # Compute all pairwise squared distances and return k smallest edges as (dist, i, j)
+def squared_distance(p, q):
+    dx = p[0] - q[0]
+    dy = p[1] - q[1]
+    dz = p[2] - q[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+def cell_occupancy(n, k):
+    """
+    Points per grid cell for taking the k closest of n points' pairs.
+
+    For uniformly spread points, about k pairs lie within some radius r, and a
+    cell of side r holds PAIRS_PER_RADIUS_CELL * k / n points. Cells c times wider
+    hold c**3 times more same-cell pairs but open only ~1 / c as many neighbor
+    cells, which cost more each; c = (CELL_COST_RATIO * n / k) ** (1/4) balances them.
+    """
+    c = max(1.0, (CELL_COST_RATIO * n / k) ** 0.25)
+    return PAIRS_PER_RADIUS_CELL * c ** 3 * k / n
+
+
+class GridIndex:
+    """
+    Uniform grid hash over 3D points, with cells sized for points_per_cell points each.
+
+    Cells are addressed by integer cell coordinates; centers[i] is the cell of
+    point i, and lo_cell and hi_cell bound the occupied cells along each axis.
+    """
+
+    def __init__(self, points, points_per_cell=1):
+        self.points = points
+        lo = [min(p[a] for p in points) for a in range(3)]
+        hi = [max(p[a] for p in points) for a in range(3)]
+        volume = 1
+        for a in range(3):
+            volume *= hi[a] - lo[a] + 1
+        self.cell = max(1, round((volume * points_per_cell / len(points)) ** (1 / 3)))
+
+        self.centers = [self.cell_of(p) for p in points]
+        self.cells = defaultdict(list)
+        for i, center in enumerate(self.centers):
+            self.cells[center].append(i)
+        self.lo_cell = self.cell_of(lo)
+        self.hi_cell = self.cell_of(hi)
+
+    def cell_of(self, p):
+        cell = self.cell
+        return (p[0] // cell, p[1] // cell, p[2] // cell)
+
+
+def axis_layouts(p, center, cell, lo_cell, hi_cell):
+    """Per axis (nearer gap, axis, its direction, farther gap, largest t), nearest first."""
+    layouts = []
+    for a in range(3):
+        lo_gap = p[a] - center[a] * cell + 1
+        hi_gap = (center[a] + 1) * cell - p[a]
+        reach = 2 * max(center[a] - lo_cell[a], hi_cell[a] - center[a])
+        if hi_gap <= lo_gap:
+            layouts.append((hi_gap, a, 1, lo_gap, reach))
+        else:
+            layouts.append((lo_gap, a, -1, hi_gap, reach))
+    layouts.sort()
+    return layouts
+
+
+def axis_step(layout, t, cell):
+    """(squared distance, cell offset) of the t-th nearest cell along one axis."""
+    if t == 0:
+        return 0, 0
+    near, _, sign, far, _ = layout
+    d = (t + 1) // 2
+    if t % 2:
+        return (near + (d - 1) * cell) ** 2, sign * d
+    return (far + (d - 1) * cell) ** 2, -sign * d
+
+
+def iter_closest_pairs(points, k=None):
+    """
+    Lazily yield every pair as (d2, i, j) with i < j, in increasing (d2, i, j) order.
+
+    Pairs inside one grid cell are found up front. Every other pair is found when
+    one of its points opens the other's cell, and a single global heap of cell
+    openings, keyed by the squared distance from the point to the cell box, opens
+    cells in increasing order of that lower bound. Found pairs below the smallest
+    unopened bound are final, so only the neighbor cells that could still hold a
+    closer pair than the next one yielded are ever looked at.
+
+    Along one axis the cells around a point, sorted by distance, alternate between
+    the nearer and the farther side (axis_step). A point's neighbor cells are the
+    index triples (t0, t1, t2) over its three axes, enumerated in order as a tree
+    where a triple's children raise its last nonzero index or a later one. k is
+    the number of pairs the caller expects to take (all of them by default); it
+    only sizes the cells.
+    """
     n = len(points)
-    edges = []
+    if n < 2:
+        return
+    if k is None:
+        k = n * (n - 1) // 2
+    index = GridIndex(points, cell_occupancy(n, k))
+    cell = index.cell
+    cells = index.cells
+    centers = index.centers
+
+    def layouts_of(i):
+        return axis_layouts(points[i], centers[i], cell, index.lo_cell, index.hi_cell)
+
+    def first_face(layouts, start):
+        # the first axis from `start` on that has any neighbor cells
+        return next((a for a in range(start, 3) if layouts[a][4] > 0), None)
+
+    def face(a):
+        return tuple(1 if b == a else 0 for b in range(3))
+
+    candidates = []
+    for bucket in cells.values():
+        for x, i in enumerate(bucket):
+            for j in bucket[x + 1:]:
+                candidates.append((squared_distance(points[i], points[j]), min(i, j), max(i, j)))
+    heapq.heapify(candidates)
+
+    # each point starts with its nearest face cell; the other face cells follow
+    # in order as each one is opened, deeper cells are children in the tree
+    events = []
     for i in range(n):
-        xi, yi, zi = points[i]
-        for j in range(i + 1, n):
-            xj, yj, zj = points[j]
-            dx = xi - xj
-            dy = yi - yj
-            dz = zi - zj
-            d2 = dx * dx + dy * dy + dz * dz
-            edges.append((d2, i, j))
-    if k >= len(edges):
-        edges.sort()
-        return edges
-    # use heapq.nsmallest for efficiency
-    return heapq.nsmallest(k, edges)
+        layouts = layouts_of(i)
+        a = first_face(layouts, 0)
+        if a is not None:
+            events.append((axis_step(layouts[a], 1, cell)[0], i, face(a)))
+    heapq.heapify(events)
+
+    seen = set()
+    while True:
+        while candidates and (not events or candidates[0][0] < events[0][0]):
+            yield heapq.heappop(candidates)
+        if not events:
+            return
+
+        bound, i, ts = heapq.heappop(events)
+        layouts = layouts_of(i)
+
+        target = list(centers[i])
+        for layout, t in zip(layouts, ts):
+            target[layout[1]] += axis_step(layout, t, cell)[1]
+        for j in cells.get(tuple(target), ()):
+            pair = (i, j) if i < j else (j, i)
+            if pair not in seen:
+                seen.add(pair)
+                heapq.heappush(candidates, (squared_distance(points[i], points[j]),) + pair)
+
+        last = max(a for a in range(3) if ts[a])
+        if sum(ts) == 1:
+            a = first_face(layouts, last + 1)
+            if a is not None:
+                heapq.heappush(events, (axis_step(layouts[a], 1, cell)[0], i, face(a)))
+        for a in range(last, 3):
+            t = ts[a]
+            if t < layouts[a][4]:
+                child = bound - axis_step(layouts[a], t, cell)[0] + axis_step(layouts[a], t + 1, cell)[0]
+                heapq.heappush(events, (child, i, ts[:a] + (t + 1,) + ts[a + 1:]))
+
+
+def k_smallest_edges_vectorized(points, k, max_block_elements=1 << 22):
+    """
+    k closest pairs as (d2, i, j), computed with NumPy in blocks of rows.
+
+    Squared distances from a block of rows to every later point are computed
+    with int64 arithmetic, and a running top-k is kept across blocks with
+    argpartition. Everything tied with the k-th distance is kept too, so the
+    final (d2, i, j) sort matches the exact all-pairs order. Peak memory stays
+    around max_block_elements distances.
+    """
+    n = len(points)
+    if n < 2 or k <= 0:
+        return []
+    coords = np.asarray(points, dtype=np.int64)
+    block_rows = max(1, max_block_elements // n)
+    cols = np.arange(n)
+
+    unused = np.iinfo(np.int64).max
+
+    def smallest(d2):
+        # positions of the k smallest values, plus anything tied with the k-th
+        if d2.size > k:
+            kth = np.partition(d2, k - 1)[k - 1]
+            return np.flatnonzero((d2 <= kth) & (d2 < unused))
+        return np.flatnonzero(d2 < unused)
+
+    best_d2 = np.empty(0, dtype=np.int64)
+    best_i = np.empty(0, dtype=np.int64)
+    best_j = np.empty(0, dtype=np.int64)
+    for a in range(0, n - 1, block_rows):
+        b = min(a + block_rows, n - 1)
+        # columns before a + 1 can never pair with a later row
+        width = n - a - 1
+        d2 = np.zeros((b - a, width), dtype=np.int64)
+        for axis in range(3):
+            diff = coords[a:b, axis, None] - coords[None, a + 1:, axis]
+            d2 += diff * diff
+        # only pairs with i < j are candidates
+        d2[cols[None, a + 1:] <= cols[a:b, None]] = unused
+
+        flat = d2.ravel()
+        picked = smallest(flat)
+        best_d2 = np.concatenate((best_d2, flat[picked]))
+        best_i = np.concatenate((best_i, picked // width + a))
+        best_j = np.concatenate((best_j, picked % width + a + 1))
+
+        keep = smallest(best_d2)
+        best_d2, best_i, best_j = best_d2[keep], best_i[keep], best_j[keep]
+
+    order = np.lexsort((best_j, best_i, best_d2))[:k]
+    return list(zip(best_d2[order].tolist(), best_i[order].tolist(), best_j[order].tolist()))
+
+
+def k_smallest_edges(points, k):
+    # Return the k closest pairs as (dist, i, j): a blocked NumPy scan for
+    # moderate inputs, otherwise produced lazily by the grid index
+    if np is not None and len(points) <= VECTORIZE_MAX_POINTS:
+        return k_smallest_edges_vectorized(points, k)
+    return list(islice(iter_closest_pairs(points, k), k))
 
 
 def main():
@@ -106,17 +364,9 @@ def main():
     for d2, i, j in edges:
         uf.union(i, j)
 
-    # Count component sizes
-    roots = [uf.find(i) for i in range(n)]
-    ctr = Counter(roots)
-    sizes = sorted(ctr.values(), reverse=True)
-
-    # Take top 3 sizes
-    top3 = sizes[:3]
+    # Take top 3 component sizes
     # If fewer than 3 components, multiply what's available
-    prod = 1
-    for s in top3:
-        prod *= s
+    prod = uf.product_of_largest(3)
 
     print(prod)
 
@@ -2,23 +2,34 @@
 Part 2 solution for Day 8 - Playground
 
 Reads `input.txt` from the same directory, parses 3D coordinates (X,Y,Z) one per line,
-sorts all pairwise distances (Euclidean, squared distances used for comparisons),
-then connects pairs in increasing distance order until all points are in a single
-connected component. When the final union that makes the whole set connected occurs,
-prints the product of the X coordinates of the two points that were just connected.
+and connects pairs in increasing distance order (Euclidean, squared distances used for
+comparisons) until all points are in a single connected component. That final union is
+the longest edge of the Euclidean minimum spanning tree, which is computed directly
+(Borůvka over a k-d tree, or a dense Prim's algorithm) without sorting every pair.
+Prints the product of the X coordinates of the two points that were just connected.
 
 If input has fewer than 2 points, prints 0.
 """
 
 import os
+from array import array
 from collections import Counter
 
 
 class UnionFind:
+    """
+    Union by size over compact array('i') storage.
+
+    Besides the number of components, a live multiset of component sizes
+    (size -> how many components have it) is kept up to date by every union,
+    so the largest components can be read at any point of the edge stream.
+    """
+
     def __init__(self, n):
-        self.parent = list(range(n))
-        self.rank = [0] * n
+        self.parent = array('i', range(n))
+        self.size = array('i', [1]) * n
         self.count = n
+        self.size_counts = Counter({1: n}) if n else Counter()
 
     def find(self, x):
         while self.parent[x] != x:
@@ -31,16 +42,45 @@ class UnionFind:
         ry = self.find(y)
         if rx == ry:
             return False
-        if self.rank[rx] < self.rank[ry]:
-            self.parent[rx] = ry
-        elif self.rank[ry] < self.rank[rx]:
-            self.parent[ry] = rx
-        else:
-            self.parent[ry] = rx
-            self.rank[rx] += 1
+        if self.size[rx] < self.size[ry]:
+            rx, ry = ry, rx
+        for s in (self.size[rx], self.size[ry]):
+            self.size_counts[s] -= 1
+            if not self.size_counts[s]:
+                del self.size_counts[s]
+        self.parent[ry] = rx
+        self.size[rx] += self.size[ry]
+        self.size_counts[self.size[rx]] += 1
         self.count -= 1
         return True
 
+    def largest_sizes(self, k):
+        """Sizes of the k largest components, largest first."""
+        sizes = []
+        for s in sorted(self.size_counts, reverse=True):
+            sizes.extend([s] * min(self.size_counts[s], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
+
+    def product_of_largest(self, k=3):
+        """Product of the k largest component sizes (of all of them if fewer)."""
+        prod = 1
+        for s in self.largest_sizes(k):
+            prod *= s
+        return prod
+
+    def snapshot(self):
+        """Copy of the current state, to be handed back to restore()."""
+        return array('i', self.parent), array('i', self.size), self.count, Counter(self.size_counts)
+
+    def restore(self, snapshot):
+        parent, size, count, size_counts = snapshot
+        self.parent = array('i', parent)
+        self.size = array('i', size)
+        self.count = count
+        self.size_counts = Counter(size_counts)
+
 
 def load_points(path):
     pts = []
@@ -62,6 +102,194 @@ def load_points(path):
     return pts
 
 
+def decode_edge_key(key, n):
+    """
+    Both MST backends weigh edge (i, j), i < j, with the single integer
+    (d2 * n + i) * n + j. It orders edges like the tuples (d2, i, j), so ties are
+    resolved exactly as sorting all edges would. Returns (d2, i, j).
+    """
+    rest, j = divmod(key, n)
+    d2, i = divmod(rest, n)
+    return d2, i, j
+
+
+def mst_last_edge_prim(points):
+    """
+    Longest edge of the Euclidean MST with a dense Prim's algorithm.
+
+    Coordinates are packed into flat arrays and every remaining point keeps the
+    key of its cheapest edge into the tree: O(n^2) time, O(n) memory.
+
+    Returns:
+        (d2, i, j) of the final union that connects all points, or None if n < 2
+    """
+    n = len(points)
+    if n < 2:
+        return None
+    xs = array('q', (p[0] for p in points))
+    ys = array('q', (p[1] for p in points))
+    zs = array('q', (p[2] for p in points))
+
+    best = [-1] * n
+    remaining = list(range(1, n))
+    v = 0
+    longest = -1
+    while remaining:
+        xv = xs[v]
+        yv = ys[v]
+        zv = zs[v]
+        pick = -1
+        pick_key = -1
+        for pos, u in enumerate(remaining):
+            dx = xs[u] - xv
+            dy = ys[u] - yv
+            dz = zs[u] - zv
+            lo, hi = (u, v) if u < v else (v, u)
+            key = ((dx * dx + dy * dy + dz * dz) * n + lo) * n + hi
+            if best[u] < 0 or key < best[u]:
+                best[u] = key
+            if pick < 0 or best[u] < pick_key:
+                pick = pos
+                pick_key = best[u]
+        v = remaining[pick]
+        remaining[pick] = remaining[-1]
+        remaining.pop()
+        if pick_key > longest:
+            longest = pick_key
+    return decode_edge_key(longest, n)
+
+
+class KDTree:
+    """
+    Static k-d tree over 3D points, stored as flat per-node arrays.
+
+    Nodes split the widest axis at the median; leaves hold up to leaf_size points
+    as a slice of `order`. Every node keeps its bounding box for distance pruning.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        self.points = points
+        self.order = list(range(len(points)))
+        self.leaf_size = leaf_size
+        self.start = []
+        self.stop = []
+        self.left = []
+        self.right = []
+        self.box = []
+        self._build(0, len(points))
+
+    def _build(self, start, stop):
+        node = len(self.start)
+        idx = self.order[start:stop]
+        pts = self.points
+        box = tuple(f(pts[i][a] for i in idx) for a in range(3) for f in (min, max))
+        self.start.append(start)
+        self.stop.append(stop)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.box.append(box)
+        if stop - start > self.leaf_size:
+            axis = max(range(3), key=lambda a: box[2 * a + 1] - box[2 * a])
+            idx.sort(key=lambda i: pts[i][axis])
+            self.order[start:stop] = idx
+            mid = (start + stop) // 2
+            self.left[node] = self._build(start, mid)
+            self.right[node] = self._build(mid, stop)
+        return node
+
+
+def mst_last_edge_boruvka(points, leaf_size=16):
+    """
+    Longest edge of the Euclidean MST with Borůvka's algorithm over a k-d tree.
+
+    Each round finds, for every component, its cheapest edge to another component:
+    every point searches the tree for its nearest point outside its component,
+    skipping subtrees entirely inside it and boxes farther than the component's
+    best edge so far. Components at least halve per round, O(log n) rounds.
+
+    Returns:
+        (d2, i, j) of the final union that connects all points, or None if n < 2
+    """
+    n = len(points)
+    if n < 2:
+        return None
+    nn = n * n
+    tree = KDTree(points, leaf_size)
+    order, start, stop = tree.order, tree.start, tree.stop
+    left, right, boxes = tree.left, tree.right, tree.box
+    uf = UnionFind(n)
+    longest = -1
+
+    while uf.count > 1:
+        comp = [uf.find(i) for i in range(n)]
+
+        # component id of each node, or -1 when its points span several components
+        node_comp = [0] * len(start)
+        for node in range(len(start) - 1, -1, -1):
+            if left[node] < 0:
+                first = comp[order[start[node]]]
+                same = all(comp[i] == first for i in order[start[node]:stop[node]])
+                node_comp[node] = first if same else -1
+            else:
+                a = node_comp[left[node]]
+                node_comp[node] = a if a == node_comp[right[node]] else -1
+
+        best = {}
+        for i in range(n):
+            c = comp[i]
+            x, y, z = points[i]
+            bound = best.get(c, -1)
+            stack = [(0, 0)]
+            while stack:
+                node, dist = stack.pop()
+                if node_comp[node] == c or (bound >= 0 and dist * nn > bound):
+                    continue
+                if left[node] < 0:
+                    for j in order[start[node]:stop[node]]:
+                        if comp[j] != c:
+                            xj, yj, zj = points[j]
+                            d2 = (x - xj) ** 2 + (y - yj) ** 2 + (z - zj) ** 2
+                            if bound >= 0 and d2 * nn > bound:
+                                continue
+                            key = (d2 * n + i) * n + j if i < j else (d2 * n + j) * n + i
+                            if bound < 0 or key < bound:
+                                bound = key
+                    continue
+                children = []
+                for child in (left[node], right[node]):
+                    x0, x1, y0, y1, z0, z1 = boxes[child]
+                    dx = x0 - x if x < x0 else (x - x1 if x > x1 else 0)
+                    dy = y0 - y if y < y0 else (y - y1 if y > y1 else 0)
+                    dz = z0 - z if z < z0 else (z - z1 if z > z1 else 0)
+                    children.append((dx * dx + dy * dy + dz * dz, child))
+                # visit the nearer child first so the bound tightens early
+                if children[0][0] > children[1][0]:
+                    children.reverse()
+                stack.append((children[1][1], children[1][0]))
+                stack.append((children[0][1], children[0][0]))
+            best[c] = bound
+
+        for key in set(best.values()):
+            _, i, j = decode_edge_key(key, n)
+            if uf.union(i, j) and key > longest:
+                longest = key
+
+    return decode_edge_key(longest, n)
+
+
+def mst_last_edge(points, method="boruvka"):
+    """
+    Final union that connects all points: the longest edge of the Euclidean MST.
+
+    method is "boruvka" (k-d tree, for large inputs) or "prim" (dense, O(n) memory).
+    """
+    if method == "boruvka":
+        return mst_last_edge_boruvka(points)
+    if method == "prim":
+        return mst_last_edge_prim(points)
+    raise ValueError(f"unknown MST method: {method}")
+
+
 def main():
     base = os.path.dirname(__file__)
     input_path = os.path.join(base, "input.txt")
@@ -75,37 +303,11 @@ def main():
         print(0)
         return
 
-    # build all edges
-    edges = []
-    for i in range(n):
-        xi, yi, zi = points[i]
-        for j in range(i + 1, n):
-            xj, yj, zj = points[j]
-            dx = xi - xj
-            dy = yi - yj
-            dz = zi - zj
-            d2 = dx * dx + dy * dy + dz * dz
-            edges.append((d2, i, j))
-
-    # sort edges by distance
-    edges.sort()
-
-    uf = UnionFind(n)
-
-    last_pair = None
-    for d2, i, j in edges:
-        if uf.union(i, j):
-            # this union decreased component count
-            last_pair = (i, j)
-            if uf.count == 1:
-                # found the final union that connects all points
-                xi = points[i][0]
-                xj = points[j][0]
-                print(xi * xj)
-                return
-
-    # If we finished and never reached a single component (shouldn't happen), print 0
-    print(0)
+    # the last union of Kruskal's algorithm is the longest edge of the MST
+    _, i, j = mst_last_edge(points)
+    xi = points[i][0]
+    xj = points[j][0]
+    print(xi * xj)
 
 
 if __name__ == "__main__":
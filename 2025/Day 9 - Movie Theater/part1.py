@@ -1,29 +1,105 @@
-with open('input.txt', 'r') as f:
-    lines = f.readlines()
+def read_red_tiles(filename):
+    """Parse the red tile coordinates, one 'x,y' pair per line."""
+    with open(filename, 'r') as f:
+        lines = f.readlines()
 
-# Parse the red tile coordinates
-red_tiles = []
-for line in lines:
-    line = line.strip()
-    if line:
-        x, y = map(int, line.split(','))
-        red_tiles.append((x, y))
+    red_tiles = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            x, y = map(int, line.split(','))
+            red_tiles.append((x, y))
+    return red_tiles
 
-# Find the largest rectangle using two red tiles as opposite corners
-max_area = 0
 
-for i in range(len(red_tiles)):
-    for j in range(i + 1, len(red_tiles)):
-        x1, y1 = red_tiles[i]
-        x2, y2 = red_tiles[j]
+def rectangle_area(p, q):
+    # The rectangle dimensions are inclusive of both corners
+    return (abs(q[0] - p[0]) + 1) * (abs(q[1] - p[1]) + 1)
 
-        # Calculate the area of the rectangle with opposite corners at (x1, y1) and (x2, y2)
-        # The rectangle dimensions are inclusive of both corners
-        width = abs(x2 - x1) + 1
-        height = abs(y2 - y1) + 1
-        area = width * height
 
-        max_area = max(max_area, area)
+def staircases(points):
+    """
+    Lower-left and upper-right staircases of a point set, both sorted by x
+    (and therefore by decreasing y).
 
-print(max_area)
+    A tile dominated towards the upper right by another tile never gives a larger
+    upper-right corner than that tile, and symmetrically for the lower-left corner,
+    so only these extreme points of the orthogonal hull can hold the best pair.
+    Convex hull vertices would not do: in {(10,6), (8,4), (7,3), (5,8)} the best
+    pair (8,4)-(5,8) has area 20, and (8,4) lies inside the hull of the others,
+    whose best vertex pair only reaches 18.
+    """
+    lower_left = []
+    min_y = None
+    for x, y in sorted(set(points)):
+        if min_y is None or y < min_y:
+            lower_left.append((x, y))
+            min_y = y
 
+    upper_right = []
+    max_y = None
+    for x, y in sorted(set(points), reverse=True):
+        if max_y is None or y > max_y:
+            upper_right.append((x, y))
+            max_y = y
+    upper_right.reverse()
+
+    return lower_left, upper_right
+
+
+def max_area_between(lower_left, upper_right):
+    """
+    Best (qx - px + 1) * (qy - py + 1) over p in lower_left and q in upper_right.
+
+    Both staircases run left to right and downwards, which makes the area matrix
+    supermodular: the best q index never decreases as p moves right. A divide and
+    conquer over p then scans each q range once per level, O((h1 + h2) log h1).
+    Pairs that are not lower-left/upper-right get a non-positive value.
+    """
+    best = 0
+    stack = [(0, len(lower_left) - 1, 0, len(upper_right) - 1)]
+    while stack:
+        lo, hi, qlo, qhi = stack.pop()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        px, py = lower_left[mid]
+        best_q = qlo
+        best_value = None
+        for j in range(qlo, qhi + 1):
+            qx, qy = upper_right[j]
+            value = (qx - px + 1) * (qy - py + 1)
+            if best_value is None or value > best_value:
+                best_value = value
+                best_q = j
+        best = max(best, best_value)
+        stack.append((lo, mid - 1, qlo, best_q))
+        stack.append((mid + 1, hi, best_q, qhi))
+    return best
+
+
+def max_rectangle_area(red_tiles):
+    """
+    Largest rectangle using two red tiles as opposite corners.
+
+    A pair either runs lower-left to upper-right, or upper-left to lower-right,
+    which is the same problem with y mirrored; each is solved on its staircases.
+    """
+    if len(red_tiles) < 2:
+        return 0
+    max_area = 0
+    for tiles in (red_tiles, [(x, -y) for x, y in red_tiles]):
+        lower_left, upper_right = staircases(tiles)
+        max_area = max(max_area, max_area_between(lower_left, upper_right))
+    return max_area
+
+
+def main():
+    red_tiles = read_red_tiles('input.txt')
+
+    # Find the largest rectangle using two red tiles as opposite corners
+    print(max_rectangle_area(red_tiles))
+
+
+if __name__ == "__main__":
+    main()
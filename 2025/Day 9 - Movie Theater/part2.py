@@ -1,7 +1,331 @@
+import heapq
+import multiprocessing
+import sys
 import time
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 
-def main():
+class PolygonIndex:
+    """
+    Point queries against the polygon formed by connecting consecutive red tiles.
+
+    Ray casting uses a segment tree over the vertical edges: the distinct edge
+    endpoints cut the y axis into slabs [ys[k], ys[k + 1]), and each edge is stored,
+    by x, in the O(log n) tree nodes that exactly cover its slabs. The edges
+    spanning a slab are those on its leaf-to-root path, so counting crossings to
+    the right of a point bisects O(log n) sorted lists, and the tree takes
+    O(n log n) space however the edges overlap. Boundary checks bisect per-row
+    horizontal and per-column vertical intervals.
+    """
+
+    def __init__(self, red_tiles):
+        n = len(red_tiles)
+        self.red_set = set(red_tiles)
+        self.h_segments = []  # (y, x_min, x_max) - horizontal segments
+        self.v_segments = []  # (x, y_min, y_max) - vertical segments
+
+        for i in range(n):
+            x1, y1 = red_tiles[i]
+            x2, y2 = red_tiles[(i + 1) % n]
+
+            if y1 == y2:
+                # Horizontal segment
+                self.h_segments.append((y1, min(x1, x2), max(x1, x2)))
+            elif x1 == x2:
+                # Vertical segment
+                self.v_segments.append((x1, min(y1, y2), max(y1, y2)))
+
+        # Boundary intervals per row and per column, as parallel sorted start/end lists
+        self.h_coverage = self._coverage((y, x_min, x_max) for y, x_min, x_max in self.h_segments)
+        self.v_coverage = self._coverage((x, y_min, y_max) for x, y_min, y_max in self.v_segments)
+
+        # A segment is active on [y_min, y_max) to handle vertices correctly
+        self.slab_ys = sorted({y for _, y_min, y_max in self.v_segments for y in (y_min, y_max)})
+        slab_of = {y: k for k, y in enumerate(self.slab_ys)}
+        self.slab_count = max(len(self.slab_ys) - 1, 0)
+        self.slab_tree = [[] for _ in range(2 * self.slab_count)]
+        for seg_x, y_min, y_max in sorted(self.v_segments):
+            lo = slab_of[y_min] + self.slab_count
+            hi = slab_of[y_max] + self.slab_count
+            while lo < hi:
+                if lo & 1:
+                    self.slab_tree[lo].append(seg_x)
+                    lo += 1
+                if hi & 1:
+                    hi -= 1
+                    self.slab_tree[hi].append(seg_x)
+                lo >>= 1
+                hi >>= 1
+
+    @staticmethod
+    def _coverage(segments):
+        coverage = defaultdict(list)
+        for key, lo, hi in segments:
+            coverage[key].append((lo, hi))
+        result = {}
+        for key, intervals in coverage.items():
+            intervals.sort()
+            merged = [list(intervals[0])]
+            for lo, hi in intervals[1:]:
+                if lo <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], hi)
+                else:
+                    merged.append([lo, hi])
+            result[key] = ([lo for lo, _ in merged], [hi for _, hi in merged])
+        return result
+
+    @staticmethod
+    def _covers(coverage, key, value):
+        if key not in coverage:
+            return False
+        starts, ends = coverage[key]
+        i = bisect_right(starts, value) - 1
+        return i >= 0 and value <= ends[i]
+
+    def is_on_boundary(self, x, y):
+        """Check if point is on any connecting segment between red tiles (boundary)"""
+        return self._covers(self.h_coverage, y, x) or self._covers(self.v_coverage, x, y)
+
+    def _slab_path(self, y):
+        """Tree nodes holding the vertical segments spanning row y (half-open in y)."""
+        k = bisect_right(self.slab_ys, y) - 1
+        if k < 0 or k >= self.slab_count:
+            return []
+        node = k + self.slab_count
+        path = []
+        while node:
+            if self.slab_tree[node]:
+                path.append(self.slab_tree[node])
+            node >>= 1
+        return path
+
+    def vertical_crossings(self, y):
+        """Sorted x of the vertical segments spanning row y (half-open in y)."""
+        return list(heapq.merge(*self._slab_path(y)))
+
+    def count_crossings_to_right(self, x, y):
+        """Count how many vertical segments are crossed by a ray going right from (x, y)"""
+        return sum(len(xs) - bisect_right(xs, x) for xs in self._slab_path(y))
+
+    def is_inside(self, x, y):
+        """Ray casting algorithm to check if point is inside polygon"""
+        return self.count_crossings_to_right(x, y) % 2 == 1
+
+    def is_valid_tile(self, x, y):
+        """Check if tile is red or green (valid for rectangle)"""
+        if (x, y) in self.red_set:
+            return True
+        if self.is_on_boundary(x, y):
+            return True
+        return self.is_inside(x, y)
+
+
+class RectangleValidityIndex:
+    """
+    Coordinate-compressed raster of the polygon with a 2-D prefix sum of invalid cells.
+
+    Compressed column 2k stands for x = xs[k] and column 2k + 1 for the open gap
+    (xs[k], xs[k + 1]); rows likewise for y. Polygon edges only run along those
+    coordinates, so every compressed cell is entirely valid (red, green or an
+    empty gap) or entirely invalid, and checking a rectangle between two red
+    tiles is one O(1) prefix-sum lookup of its four corners.
+    """
+
+    def __init__(self, red_tiles, polygon=None):
+        if polygon is None:
+            polygon = PolygonIndex(red_tiles)
+        n = len(red_tiles)
+        self.xs = sorted(set(x for x, y in red_tiles))
+        self.ys = sorted(set(y for x, y in red_tiles))
+        self.x_index = {x: i for i, x in enumerate(self.xs)}
+        self.y_index = {y: i for i, y in enumerate(self.ys)}
+        width = 2 * len(self.xs) - 1
+        height = 2 * len(self.ys) - 1
+
+        # Boundary cells: every edge between consecutive red tiles
+        valid = [bytearray(width) for _ in range(height)]
+        for i in range(n):
+            x1, y1 = red_tiles[i]
+            x2, y2 = red_tiles[(i + 1) % n]
+            c1, c2 = sorted((2 * self.x_index[x1], 2 * self.x_index[x2]))
+            r1, r2 = sorted((2 * self.y_index[y1], 2 * self.y_index[y2]))
+            for r in range(r1, r2 + 1):
+                valid[r][c1:c2 + 1] = b'\x01' * (c2 - c1 + 1)
+
+        def representative(values, i):
+            # None when an odd (gap) index holds no integer coordinate
+            if i % 2 == 0:
+                return values[i // 2]
+            value = values[i // 2] + 1
+            return value if value < values[i // 2 + 1] else None
+
+        column_x = [representative(self.xs, c) for c in range(width)]
+
+        # Interior cells: ray casting to the right, one sweep per compressed row
+        for r in range(height):
+            y = representative(self.ys, r)
+            row = valid[r]
+            if y is None:
+                row[:] = b'\x01' * width
+                continue
+            crossing_x = polygon.vertical_crossings(y)
+            k = len(crossing_x)
+            for c in range(width - 1, -1, -1):
+                x = column_x[c]
+                if x is None:
+                    row[c] = 1
+                    continue
+                while k > 0 and crossing_x[k - 1] > x:
+                    k -= 1
+                if (len(crossing_x) - k) % 2 == 1:
+                    row[c] = 1
+
+        # prefix[r][c] = invalid cells in rows < r and columns < c
+        self.prefix = [[0] * (width + 1)]
+        for r in range(height):
+            above = self.prefix[-1]
+            line = [0] * (width + 1)
+            running = 0
+            row = valid[r]
+            for c in range(width):
+                running += 1 - row[c]
+                line[c + 1] = above[c + 1] + running
+            self.prefix.append(line)
+
+    def is_valid(self, x1, y1, x2, y2):
+        """Check if the rectangle between two red tiles holds only red or green tiles."""
+        c1, c2 = sorted((2 * self.x_index[x1], 2 * self.x_index[x2]))
+        r1, r2 = sorted((2 * self.y_index[y1], 2 * self.y_index[y2]))
+        p = self.prefix
+        invalid = p[r2 + 1][c2 + 1] - p[r1][c2 + 1] - p[r2 + 1][c1] + p[r1][c1]
+        return invalid == 0
+
+
+def iter_pairs_by_area(red_tiles):
+    """
+    Lazily yield (area, i, j), i < j, in the order of sorting all pairs descending.
+
+    Each row i is a frontier over its partners j > i. Only the best partner of
+    every row is computed up front; a row's remaining partners are heapified the
+    first time its head is consumed. A global heap of row heads then merges the
+    rows, so memory stays O(n) plus the rows actually reached before termination.
+    """
+    n = len(red_tiles)
+
+    def row_area(i, j):
+        x1, y1 = red_tiles[i]
+        x2, y2 = red_tiles[j]
+        return (abs(x2 - x1) + 1) * (abs(y2 - y1) + 1)
+
+    frontier = []
+    for i in range(n - 1):
+        best = max((row_area(i, j), j) for j in range(i + 1, n))
+        frontier.append((-best[0], -i, -best[1]))
+    heapq.heapify(frontier)
+
+    rows = {}
+    while frontier:
+        neg_area, neg_i, neg_j = frontier[0]
+        yield -neg_area, -neg_i, -neg_j
+
+        i = -neg_i
+        row = rows.get(i)
+        if row is None:
+            # Materialize this row, without the head that was just yielded
+            row = [(-row_area(i, j), -j) for j in range(i + 1, n) if j != -neg_j]
+            heapq.heapify(row)
+            rows[i] = row
+        if row:
+            neg_area, neg_j = heapq.heappop(row)
+            heapq.heapreplace(frontier, (neg_area, neg_i, neg_j))
+        else:
+            heapq.heappop(frontier)
+            del rows[i]
+
+
+_worker_tiles = None
+_worker_validity = None
+_worker_best = None
+
+
+def _init_worker(red_tiles, best_area):
+    global _worker_tiles, _worker_validity, _worker_best
+    _worker_tiles = red_tiles
+    _worker_validity = RectangleValidityIndex(red_tiles)
+    _worker_best = best_area
+
+
+def _validate_batch(batch):
+    """
+    Return the first valid (area, i, j) of a batch in descending area order, or None.
+    Candidates below the best area any worker has found so far are skipped.
+    """
+    for area, i, j in batch:
+        # Ties are still checked so the reported corners match the sequential order
+        if area < _worker_best.value:
+            return None
+        x1, y1 = _worker_tiles[i]
+        x2, y2 = _worker_tiles[j]
+        if _worker_validity.is_valid(x1, y1, x2, y2):
+            with _worker_best.get_lock():
+                if area > _worker_best.value:
+                    _worker_best.value = area
+            return area, i, j
+    return None
+
+
+def find_max_valid_area_parallel(red_tiles, workers, batch_size=256):
+    """
+    Validate candidate pairs in batches across a process pool.
+
+    Batches are taken in descending area order from iter_pairs_by_area. The best
+    area found so far lives in shared memory, so every worker prunes against it,
+    and no new batch is submitted once the next candidate cannot beat it.
+
+    Returns:
+        (area, i, j) of the largest valid rectangle, or None
+    """
+    best_area = multiprocessing.Value('q', 0)
+    pairs = iter_pairs_by_area(red_tiles)
+    results = []
+    pending = set()
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(red_tiles, best_area)) as pool:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < 2 * workers:
+                batch = list(islice(pairs, batch_size))
+                if not batch or batch[0][0] < best_area.value:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(_validate_batch, batch))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            results.extend(f.result() for f in done if f.result() is not None)
+
+    return max(results, default=None)
+
+
+def parse_workers(argv):
+    """Optional `--workers N`: validate candidate pairs on N processes."""
+    if '--workers' not in argv:
+        return 1
+    i = argv.index('--workers')
+    try:
+        workers = int(argv[i + 1])
+    except (IndexError, ValueError):
+        print("--workers expects an integer number of processes")
+        sys.exit(1)
+    if workers < 1:
+        print("--workers expects at least 1 process")
+        sys.exit(1)
+    return workers
+
+
+def main(workers=1):
     start_time = time.time()
 
     # Read input
@@ -16,226 +340,57 @@ def main():
             x, y = map(int, line.split(','))
             red_tiles.append((x, y))
 
-    red_set = set(red_tiles)
     n = len(red_tiles)
 
     print(f"Number of red tiles: {n}")
 
-    # Build segments (horizontal and vertical) between consecutive red tiles
-    # The polygon is formed by connecting consecutive red tiles
-    h_segments = []  # (y, x_min, x_max) - horizontal segments
-    v_segments = []  # (x, y_min, y_max) - vertical segments
+    # Index the polygon formed by connecting consecutive red tiles
+    polygon = PolygonIndex(red_tiles)
 
-    for i in range(n):
-        x1, y1 = red_tiles[i]
-        x2, y2 = red_tiles[(i + 1) % n]
-
-        if y1 == y2:
-            # Horizontal segment
-            h_segments.append((y1, min(x1, x2), max(x1, x2)))
-        elif x1 == x2:
-            # Vertical segment
-            v_segments.append((x1, min(y1, y2), max(y1, y2)))
-
-    print(f"Horizontal segments: {len(h_segments)}, Vertical segments: {len(v_segments)}")
-
-    # Precompute horizontal segment coverage
-    h_coverage = defaultdict(list)
-    for seg_y, x_min, x_max in h_segments:
-        h_coverage[seg_y].append((x_min, x_max))
-    for y in h_coverage:
-        h_coverage[y].sort()
-
-    # Precompute vertical segment coverage
-    v_coverage = defaultdict(list)
-    for seg_x, y_min, y_max in v_segments:
-        v_coverage[seg_x].append((y_min, y_max))
-    for x in v_coverage:
-        v_coverage[x].sort()
-
-    # Sort vertical segments by x for ray casting
-    v_segments_sorted = sorted(v_segments, key=lambda s: s[0])
+    print(f"Horizontal segments: {len(polygon.h_segments)}, Vertical segments: {len(polygon.v_segments)}")
 
     # Get all unique y values from red tiles
     all_y = sorted(set(y for x, y in red_tiles))
     print(f"Unique y values: {len(all_y)}")
 
-    def is_on_boundary(x, y):
-        """Check if point is on any connecting segment between red tiles (boundary)"""
-        # Check horizontal segments
-        if y in h_coverage:
-            for x_min, x_max in h_coverage[y]:
-                if x_min <= x <= x_max:
-                    return True
-
-        # Check vertical segments
-        if x in v_coverage:
-            for y_min, y_max in v_coverage[x]:
-                if y_min <= y <= y_max:
-                    return True
-
-        return False
+    # Find the largest valid rectangle
+    max_area = 0
+    best_rect = None
 
-    def count_crossings_to_right(x, y):
-        """Count how many vertical segments are crossed by a ray going right from (x, y)"""
-        crossings = 0
-        for seg_x, seg_y_min, seg_y_max in v_segments_sorted:
-            if seg_x <= x:
-                continue
-            # Use half-open interval [y_min, y_max) to handle vertices correctly
-            if seg_y_min <= y < seg_y_max:
-                crossings += 1
-        return crossings
+    if workers > 1:
+        print(f"Checking pairs in order of decreasing potential area on {workers} workers...")
+        result = find_max_valid_area_parallel(red_tiles, workers)
+        if result:
+            max_area, i, j = result
+            best_rect = red_tiles[i] + red_tiles[j]
+    else:
+        # Each worker builds its own index, so only the sequential path needs one here
+        print("Building compressed validity index...")
+        validity = RectangleValidityIndex(red_tiles, polygon)
 
-    def is_inside_polygon(x, y):
-        """Ray casting algorithm to check if point is inside polygon"""
-        return count_crossings_to_right(x, y) % 2 == 1
+        # Pairs come lazily in order of decreasing potential area
+        print("Checking pairs in order of decreasing potential area...")
 
-    def is_valid_tile(x, y):
-        """Check if tile is red or green (valid for rectangle)"""
-        if (x, y) in red_set:
-            return True
-        if is_on_boundary(x, y):
-            return True
-        return is_inside_polygon(x, y)
-
-    def get_valid_x_range_for_y(y):
-        """
-        Get the valid x-ranges (inside or on boundary) for a given y.
-        Returns a list of (x_min, x_max) tuples representing valid ranges.
-        """
-        # Find all vertical segment x-coordinates that span this y
-        crossing_x = []
-        for seg_x, seg_y_min, seg_y_max in v_segments_sorted:
-            # A vertical segment contributes to the boundary at y if y is within its range
-            if seg_y_min <= y <= seg_y_max:
-                crossing_x.append(seg_x)
-        
-        crossing_x = sorted(set(crossing_x))
-        
-        if not crossing_x:
-            return []
-        
-        # Build ranges - the interior is between pairs of crossings (odd-even rule)
-        # For a simple polygon, we alternate between inside and outside
-        ranges = []
-        
-        # Check each pair of consecutive crossings
-        for i in range(len(crossing_x) - 1):
-            x_left = crossing_x[i]
-            x_right = crossing_x[i + 1]
-            
-            # Check if the midpoint is inside the polygon
-            mid_x = (x_left + x_right) // 2
-            if is_inside_polygon(mid_x, y) or is_on_boundary(mid_x, y):
-                ranges.append((x_left, x_right))
-        
-        # Merge overlapping/adjacent ranges
-        if not ranges:
-            return []
-        
-        ranges.sort()
-        merged = [list(ranges[0])]
-        for r in ranges[1:]:
-            if r[0] <= merged[-1][1] + 1:
-                merged[-1][1] = max(merged[-1][1], r[1])
-            else:
-                merged.append(list(r))
-        
-        return [tuple(r) for r in merged]
-
-    # Precompute valid ranges for all y values in red tiles
-    print("Precomputing valid x-ranges for each y...")
-    valid_ranges_cache = {}
-    for y in all_y:
-        valid_ranges_cache[y] = get_valid_x_range_for_y(y)
-
-    def is_x_range_valid_for_y(y, x_min, x_max):
-        """Check if the entire x range [x_min, x_max] is valid for given y"""
-        if y in valid_ranges_cache:
-            ranges = valid_ranges_cache[y]
-        else:
-            ranges = get_valid_x_range_for_y(y)
-        
-        for r_min, r_max in ranges:
-            if r_min <= x_min and x_max <= r_max:
-                return True
-        return False
-
-    def check_rectangle_valid(x1, y1, x2, y2):
-        """Check if rectangle is valid - all tiles must be red or green"""
-        min_x_r = min(x1, x2)
-        max_x_r = max(x1, x2)
-        min_y_r = min(y1, y2)
-        max_y_r = max(y1, y2)
-
-        # Check all y values in the rectangle that are in our red tile y-coordinates
-        for y in all_y:
-            if min_y_r <= y <= max_y_r:
-                if not is_x_range_valid_for_y(y, min_x_r, max_x_r):
-                    return False
-        
-        # For y values between red tile y-coordinates, the valid x-range
-        # is determined by the vertical segments that span that y
-        # We need to check representative y values between consecutive red tile y-values
-        prev_y = None
-        for y in all_y:
-            if y > max_y_r:
+        checked = 0
+        for area, i, j in iter_pairs_by_area(red_tiles):
+            # Early termination
+            if area <= max_area:
+                print(f"Early termination at pair {checked}: potential area {area} <= max area {max_area}")
                 break
-            if y >= min_y_r:
-                if prev_y is not None and prev_y >= min_y_r:
-                    # Check a representative y value between prev_y and y
-                    test_y = prev_y + 1
-                    if test_y < y and min_y_r <= test_y <= max_y_r:
-                        if not is_x_range_valid_for_y(test_y, min_x_r, max_x_r):
-                            return False
-            prev_y = y
-        
-        return True
-
-    # Find the largest valid rectangle
-    max_area = 0
-    best_rect = None
 
-    # Build pairs sorted by potential area
-    print("Building pairs sorted by potential area...")
-    
-    pairs = []
-    for i in range(n):
-        x1, y1 = red_tiles[i]
-        for j in range(i + 1, n):
+            x1, y1 = red_tiles[i]
             x2, y2 = red_tiles[j]
-            width = abs(x2 - x1) + 1
-            height = abs(y2 - y1) + 1
-            area = width * height
-            pairs.append((area, i, j))
-    
-    # Sort by area descending
-    pairs.sort(reverse=True)
-    
-    print(f"Total pairs: {len(pairs)}")
-    print("Checking pairs in order of decreasing potential area...")
-    
-    checked = 0
-    for area, i, j in pairs:
-        # Early termination
-        if area <= max_area:
-            print(f"Early termination at pair {checked}: potential area {area} <= max area {max_area}")
-            break
-        
-        x1, y1 = red_tiles[i]
-        x2, y2 = red_tiles[j]
-        
-        checked += 1
-        if checked % 1000 == 0:
-            print(f"Checked {checked} pairs, current max area: {max_area}")
-
-        # Check if rectangle is valid
-        if check_rectangle_valid(x1, y1, x2, y2):
-            if area > max_area:
-                max_area = area
-                best_rect = (x1, y1, x2, y2)
-                print(f"New max area: {max_area} with rectangle corners ({x1},{y1}) and ({x2},{y2})")
+
+            checked += 1
+            if checked % 1000 == 0:
+                print(f"Checked {checked} pairs, current max area: {max_area}")
+
+            # Check if rectangle is valid
+            if validity.is_valid(x1, y1, x2, y2):
+                if area > max_area:
+                    max_area = area
+                    best_rect = (x1, y1, x2, y2)
+                    print(f"New max area: {max_area} with rectangle corners ({x1},{y1}) and ({x2},{y2})")
 
     end_time = time.time()
     
@@ -250,4 +405,4 @@ def main():
     return max_area
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_workers(sys.argv[1:]))
\ No newline at end of file